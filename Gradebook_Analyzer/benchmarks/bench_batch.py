@@ -0,0 +1,50 @@
+# benchmarks/bench_batch.py
+#
+# A term's worth of section files through run_batch with one worker and
+# with every CPU. The speed-up grows with the number of cores.
+# Run from the project folder:
+#   python -m benchmarks.bench_batch [sections] [students per section]
+
+import contextlib
+import csv
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from gradebook import run_batch
+
+
+def write_sections(folder, sections, students):
+    rng = random.Random(8)
+    for s in range(sections):
+        with open(folder / f"section_{s:03d}.csv", "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["ID", "Name", "Marks"])
+            for i in range(students):
+                writer.writerow([f"{s:03d}{i:05d}", f"Student {s}-{i}", rng.randint(0, 100)])
+
+
+def main():
+    sections = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    students = int(sys.argv[2]) if len(sys.argv) > 2 else 5_000
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = Path(tmp) / "sections"
+        folder.mkdir()
+        write_sections(folder, sections, students)
+
+        print(f"{sections} sections x {students:,} students")
+        cohorts = []
+        for workers in sorted({1, os.cpu_count() or 1}):
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                cohorts.append(run_batch([folder], Path(tmp) / f"out{workers}", workers))
+            print(f"{workers:>3} worker(s)  {time.perf_counter() - start:.2f}s")
+        assert all(c == cohorts[0] for c in cohorts)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# benchmarks/bench_grading.py
+#
+# Grading a large cohort: the separate passes main() used to make
+# (assign_grade per student, five list.count calls, two pass/fail
+# comprehensions, then the statistics functions) against analyze_marks.
+# Run from the project folder:
+#   python -m benchmarks.bench_grading [students]
+
+import random
+import sys
+import time
+
+from gradebook import (analyze_marks, assign_grade, calculate_average, calculate_median,
+                       find_max_score, find_min_score)
+
+
+def separate_passes(marks):
+    avg = calculate_average(marks)
+    med = calculate_median(marks)
+    highest = find_max_score(marks)
+    lowest = find_min_score(marks)
+    grades = {name: assign_grade(score) for name, score in marks.items()}
+    dist = {g: list(grades.values()).count(g) for g in "ABCDF"}
+    passed = [name for name, score in marks.items() if score >= 40]
+    failed = [name for name, score in marks.items() if score < 40]
+    return avg, med, highest, lowest, grades, dist, passed, failed
+
+
+def best_of(repeat, fn, *args):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = random.Random(3)
+    marks = {f"S{i:07d}": rng.randint(0, 100) for i in range(n)}
+
+    t_old, old = best_of(3, separate_passes, marks)
+    t_new, report = best_of(3, analyze_marks, marks)
+    assert old[4] == report["grades"] and old[5] == report["distribution"]
+    assert (old[6], old[7]) == (report["passed"], report["failed"])
+    assert (old[2], old[3]) == (report["highest"], report["lowest"])
+
+    print(f"{n:,} students")
+    print(f"separate passes  {t_old:.3f}s")
+    print(f"analyze_marks    {t_new:.3f}s  ({t_old / t_new:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# benchmarks/bench_loader.py
+#
+# Loading a large roster and summarising it: csv.DictReader into a dict
+# followed by the statistics functions (the old load_from_csv path)
+# against read_marks, with and without keeping the marks.
+# Reports time and peak traced memory.
+# Run from the project folder:
+#   python -m benchmarks.bench_loader [students]
+
+import csv
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from gradebook import assign_grade, calculate_average, calculate_median, read_marks
+
+
+def dictreader_load(path):
+    marks = {}
+    with open(path, "r", newline="") as f:
+        for row in csv.DictReader(f):
+            marks[row["Name"].strip()] = int(row["Marks"].strip())
+    grades = [assign_grade(score) for score in marks.values()]
+    dist = {g: grades.count(g) for g in "ABCDF"}
+    return calculate_average(marks), calculate_median(marks), min(marks.values()), max(marks.values()), dist
+
+
+def streamed(path, keep_marks):
+    _, stats, _ = read_marks(path, keep_marks=keep_marks)
+    return stats.average, stats.median(), stats.lowest[1], stats.highest[1], stats.distribution()
+
+
+def measure(fn, *args):
+    """(result, seconds, peak MB). Timed and traced in separate runs,
+    since tracing slows the run down several times."""
+    start = time.perf_counter()
+    result = fn(*args)
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    fn(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, seconds, peak / 2**20
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = random.Random(9)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "roster.csv"
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["ID", "Name", "Marks"])
+            for i in range(n):
+                writer.writerow([i, f"Student {i:07d}", rng.randint(0, 100)])
+
+        expected, t_old, m_old = measure(dictreader_load, path)
+        print(f"{n:,} students")
+        print(f"{'method':<24}{'time':>8}{'peak memory':>14}")
+        print(f"{'DictReader + median':<24}{t_old:>7.2f}s{m_old:>11.1f} MB")
+        for label, keep in (("read_marks", True), ("read_marks, stats only", False)):
+            result, seconds, peak = measure(streamed, path, keep)
+            assert result == expected
+            print(f"{label:<24}{seconds:>7.2f}s{peak:>11.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
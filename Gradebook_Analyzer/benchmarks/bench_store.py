@@ -0,0 +1,69 @@
+# benchmarks/bench_store.py
+#
+# Rank and top-10 queries on a large course: sorting the marks dict for
+# every query against the indexed GradebookStore, plus the cost of
+# recording a late batch of results.
+# Run from the project folder:
+#   python -m benchmarks.bench_store [students]
+
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from gradebook_store import GradebookStore
+
+QUERIES = 200
+
+
+def sorted_rank(marks, student):
+    ordered = sorted(marks.values(), reverse=True)
+    return ordered.index(marks[student]) + 1
+
+
+def sorted_top(marks, k=10):
+    return sorted(marks.items(), key=lambda item: -item[1])[:k]
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    for _ in range(QUERIES):
+        fn(*args)
+    return (time.perf_counter() - start) / QUERIES * 1000
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    rng = random.Random(4)
+    ids = [f"S{i:07d}" for i in range(n)]
+    marks = {student: rng.randint(0, 100) for student in ids}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with GradebookStore(Path(tmp) / "bench.db") as store:
+            store.set_assessment("BENCH", "exam")
+            start = time.perf_counter()
+            store.record_results("BENCH", "exam", marks)
+            load = time.perf_counter() - start
+
+            student = ids[n // 2]
+            assert store.rank("BENCH", student, "exam") == sorted_rank(marks, student)
+
+            rows = [
+                ("rank", timed(sorted_rank, marks, student), timed(store.rank, "BENCH", student, "exam")),
+                ("top 10", timed(sorted_top, marks), timed(store.top, "BENCH", 10, "exam")),
+            ]
+
+            late = {student: rng.randint(0, 100) for student in rng.sample(ids, 1000)}
+            start = time.perf_counter()
+            store.record_results("BENCH", "exam", late)
+            update = time.perf_counter() - start
+
+    print(f"{n:,} students; first load {load:.2f}s, 1,000 corrected results {update * 1000:.0f} ms")
+    print(f"{'query':<10}{'sort per query':>16}{'store':>12}")
+    for name, old, new in rows:
+        print(f"{name:<10}{old:>13.2f} ms{new:>9.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,8 +7,14 @@ Course: Programming for Problem Solving Using Python
 ------------------------------------------------------------
 """
 
+import argparse
 import csv
+import json
 import statistics
+import sys
+from bisect import bisect_right
+from functools import partial
+from pathlib import Path
 
 
 # -----------------------------------------------------------
@@ -34,17 +40,179 @@ def find_min_score(marks_dict):
 # TASK 4: GRADE ASSIGNMENT
 # -----------------------------------------------------------
 
-def assign_grade(score):
-    if score >= 90:
-        return "A"
-    elif 80 <= score < 90:
-        return "B"
-    elif 70 <= score < 80:
-        return "C"
-    elif 60 <= score < 70:
-        return "D"
-    else:
-        return "F"   # For marks < 60
+# (lowest mark for the grade, grade), best grade first.
+# Marks below the last boundary get FAIL_GRADE.
+GRADE_BOUNDARIES = [(90, "A"), (80, "B"), (70, "C"), (60, "D")]
+FAIL_GRADE = "F"
+PASS_MARK = 40
+MAX_MARK = 100
+
+
+class GradeScale:
+    """Grade boundaries, looked up with one bisect instead of an if/elif chain.
+
+    Whole marks from 0 to MAX_MARK are graded from a precomputed table.
+    """
+
+    def __init__(self, boundaries=GRADE_BOUNDARIES, fail_grade=FAIL_GRADE, pass_mark=PASS_MARK):
+        boundaries = sorted(boundaries)
+        self.cutoffs = [mark for mark, _ in boundaries]
+        self.letters = [fail_grade] + [grade for _, grade in boundaries]
+        self.pass_mark = pass_mark
+        self.table = [self.grade(mark) for mark in range(MAX_MARK + 1)]
+
+    @property
+    def grades(self):
+        """Grade letters, best first."""
+        return self.letters[::-1]
+
+    def grade(self, score):
+        return self.letters[bisect_right(self.cutoffs, score)]
+
+
+DEFAULT_SCALE = GradeScale()
+
+
+def assign_grade(score, scale=DEFAULT_SCALE):
+    return scale.grade(score)
+
+
+class MarkStats:
+    """Count, total, extremes and a histogram of marks, gathered one mark at a time.
+
+    Marks are whole numbers from 0 to MAX_MARK, so MAX_MARK + 1 counters
+    give the exact median and the grade counts without keeping or
+    sorting the marks (a counting sort). The rare mark outside that
+    range is kept in a list.
+    """
+
+    def __init__(self, scale=DEFAULT_SCALE):
+        self.scale = scale
+        self.count = 0
+        self.total = 0
+        self.highest = None
+        self.lowest = None
+        self.histogram = [0] * (MAX_MARK + 1)
+        self.others = []
+
+    def add(self, name, score):
+        if type(score) is int and 0 <= score <= MAX_MARK:
+            self.histogram[score] += 1
+        else:
+            self.others.append(score)
+        self.count += 1
+        self.total += score
+        # Ties keep the first student, like max() and min().
+        if self.highest is None or score > self.highest[1]:
+            self.highest = (name, score)
+        if self.lowest is None or score < self.lowest[1]:
+            self.lowest = (name, score)
+
+    def merge(self, other):
+        """Add the marks counted by another MarkStats."""
+        self.histogram = [a + b for a, b in zip(self.histogram, other.histogram)]
+        self.others += other.others
+        self.count += other.count
+        self.total += other.total
+        if other.highest is not None and (self.highest is None or other.highest[1] > self.highest[1]):
+            self.highest = other.highest
+        if other.lowest is not None and (self.lowest is None or other.lowest[1] < self.lowest[1]):
+            self.lowest = other.lowest
+        return self
+
+    @property
+    def average(self):
+        return self.total / self.count if self.count else None
+
+    def _nth(self, n):
+        """The n-th smallest mark (0-based)."""
+        below = sorted(m for m in self.others if m < 0)
+        if n < len(below):
+            return below[n]
+        n -= len(below)
+        for mark, count in enumerate(self.histogram):
+            if n < count:
+                return mark
+            n -= count
+        return sorted(m for m in self.others if m >= 0)[n]
+
+    def median(self):
+        """Same value statistics.median would give."""
+        if not self.count:
+            return None
+        mid = self.count // 2
+        if self.count % 2:
+            return self._nth(mid)
+        return (self._nth(mid - 1) + self._nth(mid)) / 2
+
+    def distribution(self):
+        """{grade: number of students}, best grade first."""
+        dist = dict.fromkeys(self.scale.grades, 0)
+        for mark, count in enumerate(self.histogram):
+            if count:
+                dist[self.scale.table[mark]] += count
+        for score in self.others:
+            dist[self.scale.grade(score)] += 1
+        return dist
+
+    def passed(self):
+        """Number of students at or above the pass mark."""
+        pass_mark = self.scale.pass_mark
+        return (sum(c for mark, c in enumerate(self.histogram) if mark >= pass_mark)
+                + sum(1 for score in self.others if score >= pass_mark))
+
+    def summary(self):
+        """The statistics as a plain dict, ready for JSON."""
+        passed = self.passed()
+        return {
+            "count": self.count,
+            "average": self.average,
+            "median": self.median(),
+            "highest": list(self.highest) if self.highest else None,
+            "lowest": list(self.lowest) if self.lowest else None,
+            "distribution": self.distribution(),
+            "passed": passed,
+            "failed": self.count - passed,
+        }
+
+
+def analyze_marks(marks_dict, scale=DEFAULT_SCALE, stats=None):
+    """Grades, distribution, pass/fail split and statistics in one pass.
+
+    stats is the MarkStats read_marks already gathered for these marks;
+    with it, the loop here only assigns grades and splits pass/fail.
+    Returns a dict with count, average, median, highest and lowest
+    (name, score), grades {name: grade}, distribution {grade: count},
+    passed and failed (lists of names).
+    """
+    table, grade = scale.table, scale.grade
+    pass_mark = scale.pass_mark
+    collect = stats is None
+    if collect:
+        stats = MarkStats(scale)
+    grades = {}
+    passed, failed = [], []
+
+    for name, score in marks_dict.items():
+        if type(score) is int and 0 <= score <= MAX_MARK:
+            grades[name] = table[score]
+        else:
+            grades[name] = grade(score)
+        (passed if score >= pass_mark else failed).append(name)
+        if collect:
+            stats.add(name, score)
+
+    return {
+        "count": stats.count,
+        "average": stats.average,
+        "median": stats.median(),
+        "highest": stats.highest,
+        "lowest": stats.lowest,
+        "grades": grades,
+        "distribution": stats.distribution(),
+        "passed": passed,
+        "failed": failed,
+    }
 
 
 # -----------------------------------------------------------
@@ -71,34 +239,77 @@ def manual_entry():
     return marks
 
 
+def read_marks(path, scale=DEFAULT_SCALE, keep_marks=True):
+    """Stream a CSV with Name and Marks columns in one pass.
+
+    Bad rows (missing fields, marks that aren't whole numbers, repeated
+    names) are skipped and reported instead of stopping the load.
+    For a repeated name the first row is kept; the old DictReader
+    loader let the last one win.
+    With keep_marks=False only the statistics are kept, so memory does
+    not grow with the roster (repeated names then can't be detected).
+    Returns (marks dict or None, MarkStats, errors), where errors is a
+    list of (line number, reason).
+    """
+    marks = {} if keep_marks else None
+    stats = MarkStats(scale)
+    errors = []
+    with open(path, "r", newline="") as f:
+        reader = csv.reader(f)
+        header = [field.strip() for field in next(reader, [])]
+        if "Name" not in header or "Marks" not in header:
+            raise ValueError("CSV must contain 'Name' and 'Marks' columns!")
+        name_col, marks_col = header.index("Name"), header.index("Marks")
+        width = max(name_col, marks_col) + 1
+
+        for row in reader:
+            if len(row) < width:
+                if row:
+                    errors.append((reader.line_num, "missing Name or Marks"))
+                continue
+            name = row[name_col].strip()
+            try:
+                score = int(row[marks_col])
+            except ValueError:
+                errors.append((reader.line_num, f"invalid marks {row[marks_col]!r} for {name}"))
+                continue
+            if not name:
+                errors.append((reader.line_num, "missing name"))
+                continue
+            if keep_marks:
+                if name in marks:
+                    errors.append((reader.line_num, f"duplicate student {name}"))
+                    continue
+                marks[name] = score
+            stats.add(name, score)
+    return marks, stats, errors
+
+
+def print_errors(errors, limit=10):
+    print(f"Skipped {len(errors)} invalid row(s):")
+    for line, reason in errors[:limit]:
+        print(f"  line {line}: {reason}")
+    if len(errors) > limit:
+        print(f"  ... and {len(errors) - limit} more")
+
+
 def load_from_csv():
+    """Returns (marks, MarkStats); ({}, None) if the file can't be used."""
     path = input("Enter CSV file path (example: students.csv): ").strip()
 
-    marks = {}
     try:
-        with open(path, "r", newline="") as f:
-            reader = csv.DictReader(f)
-
-            if "Name" not in reader.fieldnames or "Marks" not in reader.fieldnames:
-                print("ERROR: CSV must contain 'Name' and 'Marks' columns!")
-                return {}
-
-            for row in reader:
-                name = row["Name"].strip()
-                try:
-                    score = int(row["Marks"].strip())
-                except ValueError:
-                    print(f"Invalid marks for student {name}. Must be an integer.")
-                    return {}
-                marks[name] = score
-
-        print("CSV Loaded Successfully!")
-
+        marks, stats, errors = read_marks(path)
     except FileNotFoundError:
         print("ERROR: File not found. Check name & location.")
-        return {}
+        return {}, None
+    except ValueError as exc:
+        print(f"ERROR: {exc}")
+        return {}, None
 
-    return marks
+    if errors:
+        print_errors(errors)
+    print("CSV Loaded Successfully!")
+    return marks, stats
 
 
 # -----------------------------------------------------------
@@ -116,11 +327,146 @@ def print_results_table(marks, grades):
     print("-------------------------------------------\n")
 
 
+# -----------------------------------------------------------
+# BATCH MODE: MANY SECTION FILES IN PARALLEL
+# -----------------------------------------------------------
+# Every section CSV in a folder is analyzed in a process pool. Each
+# section gets <name>.csv (Name, Marks, Grade) and <name>.json (its
+# statistics and skipped rows); summary.csv and summary.json cover all
+# sections plus the whole cohort. Workers send back their MarkStats, so
+# the cohort figures are merged from those instead of re-reading files.
+
+def section_files(paths):
+    """CSV files named directly or found in the given folders."""
+    files = []
+    for path in map(Path, paths):
+        files += sorted(path.glob("*.csv")) if path.is_dir() else [path]
+    return list(dict.fromkeys(files))
+
+
+def analyze_section(path, out, scale=DEFAULT_SCALE, show_table=False):
+    """Grade one section file and write its reports. Returns (summary, MarkStats)."""
+    try:
+        marks, stats, errors = read_marks(path, scale)
+    except (OSError, ValueError) as exc:
+        return {"section": path.stem, "error": str(exc)}, None
+
+    table, grade = scale.table, scale.grade
+    grades = {}
+    with open(out / f"{path.stem}.csv", "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Name", "Marks", "Grade"])
+        for name, score in marks.items():
+            grades[name] = table[score] if 0 <= score <= MAX_MARK else grade(score)
+            writer.writerow([name, score, grades[name]])
+
+    summary = {"section": path.stem, "source": str(path), **stats.summary(),
+               "errors": [{"line": line, "reason": reason} for line, reason in errors]}
+    (out / f"{path.stem}.json").write_text(json.dumps(summary, indent=1))
+    if show_table:
+        print(f"\n{path.stem}")
+        print_results_table(marks, grades)
+    return summary, stats
+
+
+SUMMARY_FIELDS = ["section", "count", "average", "median", "highest", "lowest",
+                  "passed", "failed", "errors"]
+
+
+def write_batch_summary(sections, cohort, out):
+    """summary.json and summary.csv: one row per section and one for the cohort."""
+    (out / "summary.json").write_text(json.dumps({"cohort": cohort, "sections": sections}, indent=1))
+
+    grades = list(cohort["distribution"])
+    with open(out / "summary.csv", "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(SUMMARY_FIELDS + grades)
+        valid = [row for row in sections if "error" not in row]
+        skipped = sum(len(row["errors"]) for row in valid)
+        for row in valid + [{"section": "ALL", **cohort}]:
+            values = dict(row, errors=len(row["errors"]) if "errors" in row else skipped)
+            for key in ("highest", "lowest"):
+                values[key] = values[key][1] if values[key] else ""
+            if isinstance(values["average"], float):
+                values["average"] = round(values["average"], 2)
+            writer.writerow([values[k] for k in SUMMARY_FIELDS]
+                            + [row["distribution"][g] for g in grades])
+
+
+def run_batch(paths, out="reports", workers=None, scale=DEFAULT_SCALE, show_table=False):
+    """Analyze every section file across a process pool. Returns the cohort summary."""
+    out = Path(out)
+    out.mkdir(parents=True, exist_ok=True)
+    files = section_files(paths)
+    if not files:
+        print("No section files found!")
+        return None
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    sections = []
+    cohort = MarkStats(scale)
+    work = partial(analyze_section, out=out, scale=scale, show_table=show_table)
+    # Workers print the tables themselves; one worker keeps them in order.
+    with ProcessPoolExecutor(max_workers=1 if show_table else workers) as pool:
+        for summary, stats in pool.map(work, files, chunksize=8):
+            if stats is None:
+                print(f"Error in {summary['section']}: {summary['error']}")
+            else:
+                cohort.merge(stats)
+                if summary["errors"]:
+                    print(f"{summary['section']}: skipped {len(summary['errors'])} invalid row(s)")
+            sections.append(summary)
+
+    cohort = cohort.summary()
+    write_batch_summary(sections, cohort, out)
+    print(f"{len(files)} section(s), {cohort['count']} students: "
+          f"average {cohort['average'] or 0:.2f}, median {cohort['median']}, "
+          f"{cohort['passed']} passed, {cohort['failed']} failed")
+    print(f"Reports written to {out}/")
+    return cohort
+
+
+def parse_boundaries(text):
+    """'90:A,80:B,70:C,60:D' -> [(90, 'A'), (80, 'B'), (70, 'C'), (60, 'D')]"""
+    try:
+        return [(float(mark), grade.strip()) for mark, grade in
+                (item.split(":") for item in text.split(","))]
+    except ValueError:
+        raise argparse.ArgumentTypeError("use MARK:GRADE pairs, e.g. 90:A,80:B,70:C,60:D")
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        description="GradeBook Analyzer batch mode (run without arguments for the interactive menu)")
+    parser.add_argument("paths", nargs="+", help="section CSV files or folders of them")
+    parser.add_argument("--out", default="reports", help="folder for the reports")
+    parser.add_argument("--workers", type=int, help="processes (default: all CPUs)")
+    parser.add_argument("--boundaries", type=parse_boundaries, default=GRADE_BOUNDARIES,
+                        help="grade boundaries as MARK:GRADE pairs (default 90:A,80:B,70:C,60:D)")
+    parser.add_argument("--fail-grade", default=FAIL_GRADE)
+    parser.add_argument("--pass-mark", type=float, default=PASS_MARK)
+    parser.add_argument("--table", action="store_true", help="also print each section's table")
+    return parser.parse_args(argv)
+
+
+def batch_main(argv):
+    args = parse_args(argv)
+    scale = GradeScale(args.boundaries, args.fail_grade, args.pass_mark)
+    run_batch(args.paths, args.out, args.workers, scale, args.table)
+
+
 # -----------------------------------------------------------
 # MAIN PROGRAM LOOP
 # -----------------------------------------------------------
 
-def main():
+def main(argv=None):
+    # With arguments: batch mode (python gradebook.py sections/ --out reports)
+    argv = sys.argv[1:] if argv is None else argv
+    if argv:
+        batch_main(argv)
+        return
+
     print("\n===========================================")
     print("        Welcome to GradeBook Analyzer")
     print("===========================================\n")
@@ -138,13 +484,13 @@ def main():
         # --------------------------
 
         if choice == "1":
-            marks = manual_entry()
+            marks, stats = manual_entry(), None
             if not marks:
                 print("No valid data. Try again.\n")
                 continue
 
         elif choice == "2":
-            marks = load_from_csv()
+            marks, stats = load_from_csv()
             if not marks:
                 print("No valid CSV data. Try again.\n")
                 continue
@@ -161,14 +507,13 @@ def main():
         # TASK 3 – STATISTICS
         # --------------------------
 
-        avg = calculate_average(marks)
-        med = calculate_median(marks)
-        max_name, max_score = find_max_score(marks)
-        min_name, min_score = find_min_score(marks)
+        report = analyze_marks(marks, stats=stats)
+        max_name, max_score = report["highest"]
+        min_name, min_score = report["lowest"]
 
         print("\n===== STATISTICAL SUMMARY =====")
-        print(f"Average Score: {avg:.2f}")
-        print(f"Median Score : {med}")
+        print(f"Average Score: {report['average']:.2f}")
+        print(f"Median Score : {report['median']}")
         print(f"Highest Score: {max_name} ({max_score})")
         print(f"Lowest Score : {min_name} ({min_score})")
         print("================================\n")
@@ -177,18 +522,10 @@ def main():
         # TASK 4 – GRADE ASSIGNMENT
         # --------------------------
 
-        grades = {name: assign_grade(score) for name, score in marks.items()}
-
-        grade_dist = {
-            "A": list(grades.values()).count("A"),
-            "B": list(grades.values()).count("B"),
-            "C": list(grades.values()).count("C"),
-            "D": list(grades.values()).count("D"),
-            "F": list(grades.values()).count("F"),
-        }
+        grades = report["grades"]
 
         print("===== GRADE DISTRIBUTION =====")
-        for g, count in grade_dist.items():
+        for g, count in report["distribution"].items():
             print(f"{g}: {count} students")
         print("================================\n")
 
@@ -196,8 +533,8 @@ def main():
         # TASK 5 – PASS / FAIL USING LIST COMPREHENSION
         # --------------------------
 
-        passed_students = [name for name, score in marks.items() if score >= 40]
-        failed_students = [name for name, score in marks.items() if score < 40]
+        passed_students = report["passed"]
+        failed_students = report["failed"]
 
         print("===== PASS / FAIL SUMMARY =====")
         print(f"Passed ({len(passed_students)}): {passed_students}")
@@ -0,0 +1,325 @@
+"""
+------------------------------------------------------------
+GRADEBOOK STORE
+Results for many courses and assessments, kept between runs
+in a SQLite file and keyed by student ID (so two students
+with the same name no longer overwrite each other).
+------------------------------------------------------------
+
+Each course's weighted final marks are kept up to date as results
+arrive, and both the results and the finals have a (course, score)
+index. Rank, percentile, top-K and bottom-K queries walk that index
+instead of sorting the class.
+
+    python gradebook_store.py import students.csv --course PPS --assessment final --weight 0.6
+    python gradebook_store.py top PPS -k 5
+    python gradebook_store.py rank PPS Alice
+"""
+
+import argparse
+import csv
+import sqlite3
+from pathlib import Path
+
+from gradebook import DEFAULT_SCALE
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS students (
+    id   TEXT PRIMARY KEY,
+    name TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS assessments (
+    course     TEXT NOT NULL,
+    assessment TEXT NOT NULL,
+    weight     REAL NOT NULL,   -- share of the final mark
+    max_marks  REAL NOT NULL,
+    PRIMARY KEY (course, assessment)
+);
+
+CREATE TABLE IF NOT EXISTS results (
+    student    TEXT NOT NULL,
+    course     TEXT NOT NULL,
+    assessment TEXT NOT NULL,
+    score      REAL NOT NULL,
+    PRIMARY KEY (student, course, assessment)
+);
+CREATE INDEX IF NOT EXISTS results_by_score ON results (course, assessment, score);
+
+-- Sum of weight * percentage over the student's results so far.
+CREATE TABLE IF NOT EXISTS finals (
+    student TEXT NOT NULL,
+    course  TEXT NOT NULL,
+    points  REAL NOT NULL,
+    PRIMARY KEY (student, course)
+);
+CREATE INDEX IF NOT EXISTS finals_by_points ON finals (course, points);
+"""
+
+# Adds the change in one result to the student's points; runs before
+# the result itself is replaced. Points are rounded so that equal marks
+# reached in a different order still tie.
+ADD_POINTS = """
+INSERT INTO finals (student, course, points)
+VALUES (?1, ?2, ROUND((?4 - COALESCE((SELECT score FROM results
+    WHERE student = ?1 AND course = ?2 AND assessment = ?3), 0)) * ?5, 9))
+ON CONFLICT (student, course) DO UPDATE SET points = ROUND(points + excluded.points, 9)
+"""
+
+
+class GradebookStore:
+    """Students' results per course and assessment, persisted in SQLite.
+
+    A final mark is the weighted average of the percentages scored,
+    where a missing result counts as 0 until it is recorded. Recording
+    or correcting a result only adjusts the finals of the students in
+    that batch.
+    """
+
+    def __init__(self, path="gradebook.db"):
+        self.path = Path(path)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ----- writes ------------------------------------------------------
+
+    def add_students(self, students):
+        """Add or rename students from (id, name) pairs."""
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO students (id, name) VALUES (?, ?)"
+                " ON CONFLICT (id) DO UPDATE SET name = excluded.name", students)
+
+    def set_assessment(self, course, assessment, weight=1.0, max_marks=100):
+        """Create an assessment, or change its weight and recompute the course's finals."""
+        old = self._assessment(course, assessment)
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO assessments (course, assessment, weight, max_marks) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT (course, assessment) DO UPDATE SET"
+                " weight = excluded.weight, max_marks = excluded.max_marks",
+                (course, assessment, weight, max_marks))
+            if old is not None and old != (weight, max_marks):
+                self._recompute(course)
+
+    def _assessment(self, course, assessment):
+        return self.conn.execute(
+            "SELECT weight, max_marks FROM assessments WHERE course = ? AND assessment = ?",
+            (course, assessment)).fetchone()
+
+    def _recompute(self, course):
+        self.conn.execute("DELETE FROM finals WHERE course = ?", (course,))
+        self.conn.execute(
+            "INSERT INTO finals (student, course, points)"
+            " SELECT r.student, r.course, ROUND(SUM(a.weight * r.score * 100.0 / a.max_marks), 9)"
+            " FROM results r JOIN assessments a USING (course, assessment)"
+            " WHERE r.course = ? GROUP BY r.student", (course,))
+
+    def record_results(self, course, assessment, results):
+        """Store (student id, score) pairs for an assessment. Returns the number stored.
+
+        The assessment must exist (see set_assessment). A result that is
+        recorded again replaces the old one.
+        """
+        found = self._assessment(course, assessment)
+        if found is None:
+            raise KeyError(f"no assessment {assessment!r} in course {course!r}")
+        scale = found[0] * 100.0 / found[1]
+
+        results = dict(results)
+        with self.conn:
+            self.conn.executemany(ADD_POINTS, (
+                (student, course, assessment, score, scale) for student, score in results.items()))
+            self.conn.executemany(
+                "INSERT INTO results (student, course, assessment, score) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT (student, course, assessment) DO UPDATE SET score = excluded.score",
+                ((student, course, assessment, score) for student, score in results.items()))
+        return len(results)
+
+    def import_csv(self, path, course, assessment):
+        """Record a Name,Marks CSV (with an optional ID column) for an assessment.
+
+        Students are keyed by ID, or by name when there is no ID column.
+        Returns (rows stored, errors) with errors as (line number, reason).
+        """
+        students, results, errors = {}, {}, []
+        with open(path, "r", newline="") as f:
+            reader = csv.reader(f)
+            header = [field.strip() for field in next(reader, [])]
+            if "Name" not in header or "Marks" not in header:
+                raise ValueError("CSV must contain 'Name' and 'Marks' columns!")
+            name_col, marks_col = header.index("Name"), header.index("Marks")
+            id_col = header.index("ID") if "ID" in header else name_col
+            width = max(name_col, marks_col, id_col) + 1
+
+            for row in reader:
+                if len(row) < width:
+                    if row:
+                        errors.append((reader.line_num, "missing Name or Marks"))
+                    continue
+                student = row[id_col].strip()
+                try:
+                    score = int(row[marks_col])
+                except ValueError:
+                    errors.append((reader.line_num, f"invalid marks {row[marks_col]!r} for {student}"))
+                    continue
+                if not student or student in results:
+                    errors.append((reader.line_num, f"missing or duplicate student {student!r}"))
+                    continue
+                students[student] = row[name_col].strip()
+                results[student] = score
+
+        self.add_students(students.items())
+        return self.record_results(course, assessment, results), errors
+
+    # ----- queries -----------------------------------------------------
+
+    def _source(self, course, assessment):
+        """SQL table, score column, filter and its parameters for finals or one assessment."""
+        if assessment is None:
+            return "finals", "points", "course = ?", (course,)
+        return "results", "score", "course = ? AND assessment = ?", (course, assessment)
+
+    def _final(self, points, course):
+        total = self.conn.execute(
+            "SELECT SUM(weight) FROM assessments WHERE course = ?", (course,)).fetchone()[0]
+        return points / total if total else None
+
+    def count(self, course, assessment=None):
+        table, _, where, params = self._source(course, assessment)
+        return self.conn.execute(f"SELECT COUNT(*) FROM {table} WHERE {where}", params).fetchone()[0]
+
+    def _mark(self, course, student, assessment):
+        table, column, where, params = self._source(course, assessment)
+        row = self.conn.execute(
+            f"SELECT {column} FROM {table} WHERE {where} AND student = ?", params + (student,)).fetchone()
+        return None if row is None else row[0]
+
+    def score(self, course, student, assessment=None):
+        """A student's score, or final mark (percent) without an assessment."""
+        mark = self._mark(course, student, assessment)
+        if mark is None or assessment is not None:
+            return mark
+        return self._final(mark, course)
+
+    def rank(self, course, student, assessment=None):
+        """1 for the best student; students with equal marks share a rank."""
+        mark = self._mark(course, student, assessment)
+        if mark is None:
+            return None
+        table, column, where, params = self._source(course, assessment)
+        above = self.conn.execute(
+            f"SELECT COUNT(*) FROM {table} WHERE {where} AND {column} > ?", params + (mark,)).fetchone()[0]
+        return above + 1
+
+    def percentile(self, course, student, assessment=None):
+        """Percentage of the class scoring at or below the student."""
+        mark = self._mark(course, student, assessment)
+        if mark is None:
+            return None
+        table, column, where, params = self._source(course, assessment)
+        at_or_below = self.conn.execute(
+            f"SELECT COUNT(*) FROM {table} WHERE {where} AND {column} <= ?", params + (mark,)).fetchone()[0]
+        return 100.0 * at_or_below / self.count(course, assessment)
+
+    def _ordered(self, course, k, assessment, descending):
+        table, column, where, params = self._source(course, assessment)
+        order = "DESC" if descending else "ASC"
+        rows = self.conn.execute(
+            f"SELECT student, COALESCE(name, student), {column} FROM {table}"
+            f" LEFT JOIN students ON id = student"
+            f" WHERE {where} ORDER BY {column} {order} LIMIT ?", params + (k,)).fetchall()
+        if assessment is None:
+            rows = [(student, name, self._final(points, course)) for student, name, points in rows]
+        return rows
+
+    def top(self, course, k=10, assessment=None):
+        """(student id, name, mark) of the k best students, best first."""
+        return self._ordered(course, k, assessment, descending=True)
+
+    def bottom(self, course, k=10, assessment=None):
+        """(student id, name, mark) of the k weakest students, weakest first."""
+        return self._ordered(course, k, assessment, descending=False)
+
+    # Same (name, score) results as the functions in gradebook.py.
+
+    def find_max_score(self, course, assessment=None):
+        top = self.top(course, 1, assessment)
+        return (top[0][1], top[0][2]) if top else None
+
+    def find_min_score(self, course, assessment=None):
+        bottom = self.bottom(course, 1, assessment)
+        return (bottom[0][1], bottom[0][2]) if bottom else None
+
+    def final_grades(self, course, scale=DEFAULT_SCALE):
+        """{student id: (final mark, grade)} for a course."""
+        total = self.conn.execute(
+            "SELECT SUM(weight) FROM assessments WHERE course = ?", (course,)).fetchone()[0]
+        if not total:
+            return {}
+        rows = self.conn.execute("SELECT student, points FROM finals WHERE course = ?", (course,))
+        return {student: (points / total, scale.grade(points / total)) for student, points in rows}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="GradeBook store")
+    parser.add_argument("--db", default="gradebook.db")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    imp = sub.add_parser("import", help="record a Name,Marks CSV for an assessment")
+    imp.add_argument("csv")
+    imp.add_argument("--course", required=True)
+    imp.add_argument("--assessment", required=True)
+    imp.add_argument("--weight", type=float, default=1.0, help="share of the final mark")
+    imp.add_argument("--max-marks", type=float, default=100)
+
+    for name, help in (("top", "best students"), ("bottom", "weakest students")):
+        query = sub.add_parser(name, help=help)
+        query.add_argument("course")
+        query.add_argument("-k", type=int, default=10)
+        query.add_argument("--assessment", help="one assessment instead of the final mark")
+
+    rank = sub.add_parser("rank", help="a student's rank and percentile")
+    rank.add_argument("course")
+    rank.add_argument("student", help="student ID (or name, if imported without IDs)")
+    rank.add_argument("--assessment")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    with GradebookStore(args.db) as store:
+        if args.command == "import":
+            store.set_assessment(args.course, args.assessment, args.weight, args.max_marks)
+            stored, errors = store.import_csv(args.csv, args.course, args.assessment)
+            for line, reason in errors:
+                print(f"line {line}: {reason}")
+            print(f"Recorded {stored} result(s) for {args.course} / {args.assessment}")
+
+        elif args.command in ("top", "bottom"):
+            rows = getattr(store, args.command)(args.course, args.k, args.assessment)
+            for i, (student, name, mark) in enumerate(rows, 1):
+                print(f"{i:<4}{student:<15}{name:<20}{mark:.2f}")
+
+        else:
+            rank = store.rank(args.course, args.student, args.assessment)
+            if rank is None:
+                print(f"No marks for {args.student} in {args.course}")
+                return
+            n = store.count(args.course, args.assessment)
+            mark = store.score(args.course, args.student, args.assessment)
+            pct = store.percentile(args.course, args.student, args.assessment)
+            print(f"{args.student}: {mark:.2f}, rank {rank} of {n}, percentile {pct:.1f}")
+
+
+if __name__ == "__main__":
+    main()
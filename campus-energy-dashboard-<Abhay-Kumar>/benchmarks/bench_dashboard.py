@@ -0,0 +1,57 @@
+# benchmarks/bench_dashboard.py
+#
+# Times create_dashboard() with every point drawn (fast=False) and with
+# LTTB downsampling and density plotting (fast=True) as readings grow.
+# Run from the project folder:
+#   python -m benchmarks.bench_dashboard [max_readings]
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from energy_analysis import calculate_daily_totals, calculate_weekly_totals, create_dashboard
+
+
+def make_readings(n, buildings=50):
+    """n 15-minute readings spread over `buildings` meters."""
+    rng = np.random.default_rng(3)
+    per_building = n // buildings
+    timestamps = pd.date_range("2018-01-01", periods=per_building, freq="15min")
+    hour = timestamps.hour.to_numpy()
+    frames = []
+    for i in range(buildings):
+        base = rng.uniform(5, 200)
+        kwh = base * (1 + 0.4 * np.sin((hour - 6) / 24 * 2 * np.pi)) + rng.normal(0, base / 20, per_building)
+        frames.append(pd.DataFrame({"timestamp": timestamps, "kwh": kwh.astype("float32"),
+                                    "building": f"building{i:02d}"}))
+    return pd.concat(frames, ignore_index=True)
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    fn(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def main():
+    max_readings = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    sizes = [n for n in (10_000, 100_000, 1_000_000, 10_000_000) if n <= max_readings]
+
+    print(f"{'readings':>12} {'days':>6} {'full':>9} {'fast':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        output = Path(tmp) / "dashboard.png"
+        for n in sizes:
+            df = make_readings(n)
+            daily = calculate_daily_totals(df)
+            weekly = calculate_weekly_totals(df)
+            full = timed(create_dashboard, daily, weekly, df, fast=False, output=output)
+            fast = timed(create_dashboard, daily, weekly, df, fast=True, output=output)
+            print(f"{n:>12,} {len(daily):>6} {full:>8.2f}s {fast:>8.2f}s")
+
+
+if __name__ == "__main__":
+    main()
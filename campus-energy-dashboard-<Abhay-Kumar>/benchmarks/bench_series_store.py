@@ -0,0 +1,76 @@
+# benchmarks/bench_series_store.py
+#
+# Range-query latency of the binary series store (series_store.py)
+# against reading the building CSV and filtering it.
+# Run from the project folder:
+#   python -m benchmarks.bench_series_store [readings]
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from series_store import SeriesReader, convert_csv
+
+QUERIES = [("1 day", "1D"), ("1 week", "7D"), ("1 month", "30D"), ("1 year", "365D")]
+
+
+def write_building_csv(path, n):
+    timestamps = pd.date_range("2015-01-01", periods=n, freq="15min")
+    rng = np.random.default_rng(11)
+    kwh = 50 + 20 * np.sin(np.arange(n) / 96 * 2 * np.pi) + rng.normal(0, 3, n)
+    pd.DataFrame({"timestamp": timestamps, "kwh": kwh.round(2)}).to_csv(
+        path, index=False, date_format="%Y-%m-%d %H:%M")
+    return timestamps
+
+
+def best_of(repeat, fn, *args):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def query_csv(path, start, end):
+    df = pd.read_csv(path, parse_dates=["timestamp"])
+    return df[(df["timestamp"] >= start) & (df["timestamp"] < end)]
+
+
+def query_store(path, start, end):
+    # Opening is part of the query, as a fresh process would do it.
+    records = SeriesReader(path).range(start, end)
+    return float(records["kwh"].sum()), len(records)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    rng = np.random.default_rng(5)
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = Path(tmp) / "building.csv"
+        store_path = Path(tmp) / "building.tsb"
+        timestamps = write_building_csv(csv_path, n)
+
+        start = time.perf_counter()
+        convert_csv(csv_path, store_path)
+        print(f"{n:,} readings: CSV {csv_path.stat().st_size / 2**20:.0f} MiB, "
+              f"store {store_path.stat().st_size / 2**20:.0f} MiB, "
+              f"converted in {time.perf_counter() - start:.2f} s\n")
+
+        print(f"{'range':<8} {'rows':>9} {'csv':>10} {'store':>10}")
+        for label, length in QUERIES:
+            length = pd.Timedelta(length)
+            begin = timestamps[rng.integers(0, n // 2)]
+            end = begin + length
+            csv_time, df = best_of(2, query_csv, csv_path, begin, end)
+            store_time, (total, rows) = best_of(20, query_store, store_path, begin, end)
+            assert rows == len(df) and np.isclose(total, df["kwh"].sum(), rtol=1e-4)
+            print(f"{label:<8} {rows:>9,} {csv_time * 1e3:>8.1f}ms {store_time * 1e3:>8.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
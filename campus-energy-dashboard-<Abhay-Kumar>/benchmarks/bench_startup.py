@@ -0,0 +1,66 @@
+# benchmarks/bench_startup.py
+#
+# Import cost of energy_analysis.py per command, measured with
+# `python -X importtime`. Exits with status 1 if a command imports a
+# library it should not need, so it can guard against regressions.
+# Run from the project folder:  python -m benchmarks.bench_startup
+
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SCRIPT = Path(__file__).resolve().parent.parent / "energy_analysis.py"
+HEAVY = ("numpy", "pandas", "matplotlib")
+
+# command -> libraries it must not import
+CHECKS = {
+    "--help": HEAVY,
+    "export --export-format csv": ("matplotlib",),
+    "stats": ("matplotlib",),
+    "plot": (),
+}
+
+
+def import_profile(command, cwd):
+    """(total import time in ms, heavy top-level packages imported, wall time in ms)."""
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-X", "importtime", str(SCRIPT), *command.split()],
+                            cwd=cwd, capture_output=True, text=True)
+    wall = (time.perf_counter() - start) * 1000
+    if result.returncode:
+        raise SystemExit(f"'{command}' failed:\n{result.stderr[-2000:]}")
+    total = 0
+    loaded = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not name.startswith("  "):      # top-level imports only
+            total += int(cumulative)
+        package = name.strip().split(".")[0]
+        if package in HEAVY:
+            loaded.add(package)
+    return total / 1000, loaded, wall
+
+
+def main():
+    failed = False
+    with tempfile.TemporaryDirectory() as tmp:
+        shutil.copytree(SCRIPT.parent / "data", Path(tmp) / "data")
+        print(f"{'command':<28} {'imports':>9} {'wall':>9}  heavy libraries loaded")
+        for command, forbidden in CHECKS.items():
+            total, loaded, wall = import_profile(command, tmp)
+            bad = loaded & set(forbidden)
+            failed |= bool(bad)
+            note = ", ".join(sorted(loaded)) or "-"
+            if bad:
+                note += f"   REGRESSION: should not load {', '.join(sorted(bad))}"
+            print(f"{command:<28} {total:>7.0f}ms {wall:>7.0f}ms  {note}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
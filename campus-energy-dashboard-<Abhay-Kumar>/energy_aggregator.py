@@ -0,0 +1,141 @@
+# ======================================
+# INCREMENTAL ENERGY AGGREGATION
+# ======================================
+# Keeps per-building daily buckets (sum, count, min, max of kWh) in a
+# SQLite file and folds new readings into them as they arrive, so the
+# daily, weekly and per-building figures stay current without
+# re-reading the history.
+
+import sqlite3
+from pathlib import Path
+
+import pandas as pd
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS daily (
+    building TEXT NOT NULL,
+    day      TEXT NOT NULL,   -- YYYY-MM-DD
+    kwh_sum  REAL NOT NULL,
+    count    INTEGER NOT NULL,
+    kwh_min  REAL NOT NULL,
+    kwh_max  REAL NOT NULL,
+    PRIMARY KEY (building, day)
+);
+
+-- Latest reading folded in per building, to skip readings seen before.
+CREATE TABLE IF NOT EXISTS watermark (
+    building TEXT PRIMARY KEY,
+    last_ts  TEXT NOT NULL
+);
+"""
+
+# Merge a batch's bucket into the stored one, touching only that row.
+UPSERT = """
+INSERT INTO daily (building, day, kwh_sum, count, kwh_min, kwh_max)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (building, day) DO UPDATE SET
+    kwh_sum = kwh_sum + excluded.kwh_sum,
+    count   = count + excluded.count,
+    kwh_min = MIN(kwh_min, excluded.kwh_min),
+    kwh_max = MAX(kwh_max, excluded.kwh_max)
+"""
+
+
+class EnergyAggregator:
+    """Running daily totals per building, persisted in a SQLite state file.
+
+    update() accepts readings in any batch size, from a whole history to
+    a single 15-minute reading. Meters report in time order, so readings
+    at or before the last one seen for their building are skipped; that
+    makes it safe to feed the same data again. Use rebuild() after
+    correcting historical readings.
+    """
+
+    def __init__(self, state_file="energy_state.db"):
+        self.state_file = Path(state_file)
+        self.conn = sqlite3.connect(self.state_file)
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _watermarks(self):
+        rows = self.conn.execute("SELECT building, last_ts FROM watermark")
+        return {building: pd.Timestamp(ts) for building, ts in rows}
+
+    def update(self, readings):
+        """Fold new readings into the daily buckets. Returns the number used.
+
+        readings is a DataFrame with building, timestamp and kwh columns,
+        or an iterable of (building, timestamp, kwh) tuples.
+        """
+        if not isinstance(readings, pd.DataFrame):
+            readings = pd.DataFrame(list(readings), columns=["building", "timestamp", "kwh"])
+        if readings.empty:
+            return 0
+
+        df = pd.DataFrame({
+            "building": readings["building"].astype(str).to_numpy(),
+            "timestamp": pd.to_datetime(readings["timestamp"]).to_numpy(),
+            "kwh": pd.to_numeric(readings["kwh"], errors="coerce").to_numpy(),
+        }).dropna()
+
+        watermarks = self._watermarks()
+        if watermarks:
+            last = df["building"].map(watermarks)
+            df = df[last.isna() | (df["timestamp"] > last)]
+        if df.empty:
+            return 0
+
+        buckets = (df.groupby(["building", df["timestamp"].dt.strftime("%Y-%m-%d")])["kwh"]
+                     .agg(["sum", "count", "min", "max"]))
+        latest = df.groupby("building")["timestamp"].max()
+
+        with self.conn:
+            self.conn.executemany(UPSERT, (
+                (building, day, float(s), int(n), float(lo), float(hi))
+                for (building, day), s, n, lo, hi in buckets.itertuples(name=None)
+            ))
+            self.conn.executemany(
+                "INSERT INTO watermark (building, last_ts) VALUES (?, ?)"
+                " ON CONFLICT (building) DO UPDATE SET last_ts = MAX(last_ts, excluded.last_ts)",
+                ((building, ts.isoformat()) for building, ts in latest.items()),
+            )
+        return len(df)
+
+    def rebuild(self, readings):
+        """Forget all state and aggregate readings from scratch."""
+        with self.conn:
+            self.conn.execute("DELETE FROM daily")
+            self.conn.execute("DELETE FROM watermark")
+        return self.update(readings)
+
+    # Same results as calculate_daily_totals, calculate_weekly_totals and
+    # building_summary in energy_analysis.py.
+
+    def daily_totals(self):
+        """Campus kWh per day, with empty days as 0."""
+        rows = self.conn.execute("SELECT day, SUM(kwh_sum) FROM daily GROUP BY day ORDER BY day")
+        days = pd.DataFrame(rows.fetchall(), columns=["timestamp", "kwh"])
+        if days.empty:
+            return pd.Series(dtype=float, name="kwh", index=pd.DatetimeIndex([], name="timestamp"))
+        daily = days.set_index(pd.to_datetime(days["timestamp"]))["kwh"]
+        return daily.resample("D").sum()
+
+    def weekly_totals(self):
+        """Campus kWh per week (weeks ending on Sunday)."""
+        return self.daily_totals().resample("W").sum()
+
+    def building_summary(self):
+        """mean, min, max and sum of readings per building."""
+        rows = self.conn.execute(
+            "SELECT building, SUM(kwh_sum) / SUM(count), MIN(kwh_min), MAX(kwh_max), SUM(kwh_sum)"
+            " FROM daily GROUP BY building ORDER BY building")
+        summary = pd.DataFrame(rows.fetchall(), columns=["building", "mean", "min", "max", "sum"])
+        return summary.set_index("building")
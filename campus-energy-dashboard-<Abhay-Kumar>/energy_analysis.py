@@ -2,41 +2,304 @@
 # ENERGY ANALYSIS PROJECT 
 # ======================================
 
-import pandas as pd
+import argparse
+import hashlib
+import importlib.util
+import json
+import os
+import sys
+from functools import partial
 from pathlib import Path
-import matplotlib.pyplot as plt
+
+
+def _lazy_import(name):
+    """Return module `name`, loaded on first attribute access.
+
+    pandas and NumPy dominate startup, and `--help` should not pay for them.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+np = _lazy_import("numpy")
+pd = _lazy_import("pandas")
 
 
 # ============================================================
 # TASK 1: DATA INGESTION + VALIDATION
 # ============================================================
 
-def load_dataset():
-    data_folder = Path("data/")
-    files = list(data_folder.glob("*.csv"))
-    combined = []
+# Columns kept from every building file, with the types they are read as.
+# float32 halves the memory of kWh values; timestamps are parsed by
+# read_csv itself instead of a separate pd.to_datetime pass afterwards.
+COLUMNS = ["timestamp", "kwh"]
+KWH_DTYPE = "float32"
+
+
+def _column_names(file):
+    """Map lowercase column names to the names used in the file's header."""
+    header = pd.read_csv(file, nrows=0).columns
+    return {name.lower(): name for name in header}
+
+
+def _read_kwargs(file):
+    names = _column_names(file)
+    missing = [c for c in COLUMNS if c not in names]
+    if missing:
+        raise ValueError(f"missing column(s) {', '.join(missing)}")
+    return {
+        "usecols": [names[c] for c in COLUMNS],
+        "dtype": {names["kwh"]: KWH_DTYPE},
+        "parse_dates": [names["timestamp"]],
+        "on_bad_lines": "skip",
+    }
+
+
+def _finish_frame(df, building, buildings):
+    """Lowercase the columns and add the categorical building column."""
+    df.columns = df.columns.str.lower()
+    df["building"] = pd.Categorical.from_codes(
+        np.full(len(df), buildings.index(building), dtype=np.int16), categories=buildings)
+    return df
+
+
+def read_building(file, buildings=None):
+    """Read one building's CSV into a typed frame."""
+    file = Path(file)
+    buildings = buildings or [file.stem]
+    df = pd.read_csv(file, **_read_kwargs(file))
+    return _finish_frame(df, file.stem, buildings)
+
+
+def iter_building_chunks(file, chunksize, buildings=None):
+    """Yield a building's readings as typed frames of at most chunksize rows.
+
+    Only one chunk is in memory at a time, so this works for files
+    larger than RAM.
+    """
+    file = Path(file)
+    buildings = buildings or [file.stem]
+    with pd.read_csv(file, chunksize=chunksize, **_read_kwargs(file)) as reader:
+        for chunk in reader:
+            yield _finish_frame(chunk, file.stem, buildings)
+
+
+def _read_building_chunked(file, chunksize, buildings):
+    chunks = list(iter_building_chunks(file, chunksize, buildings))
+    if not chunks:
+        return read_building(file, buildings)
+    return pd.concat(chunks, ignore_index=True)
+
+
+def iter_dataset(data_folder="data/", chunksize=1_000_000):
+    """Yield every building's readings in chunks, one file after another."""
+    files = sorted(Path(data_folder).glob("*.csv"))
+    buildings = [f.stem for f in files]
+    for file in files:
+        yield from iter_building_chunks(file, chunksize, buildings)
+
+
+def _read_files(files, buildings, workers=None, chunksize=None):
+    """Read files into typed frames, in a process pool unless workers == 1.
+
+    Returns a list with one frame per file, or None where it failed.
+    """
+    if chunksize:
+        read = partial(_read_building_chunked, chunksize=chunksize, buildings=buildings)
+    else:
+        read = partial(read_building, buildings=buildings)
+
+    read = partial(_try_read, read)
+    if workers == 1 or len(files) <= 1:
+        return list(map(read, files))
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(read, files))
+
+
+def _try_read(read, file):
+    try:
+        return read(file)
+    except FileNotFoundError:
+        print(f"File not found: {file}")
+    except Exception as e:
+        print(f"Error reading {file}: {e}")
+    return None
+
+
+def _combine(frames, buildings):
+    """Concatenate building frames, keeping building categorical."""
+    frames = [df for df in frames if df is not None]
+    if not frames:
+        print("No building files could be read!")
+        return pd.DataFrame()
+    for df in frames:
+        # Frames read in another run may know a different set of buildings.
+        df["building"] = df["building"].cat.set_categories(buildings)
+    return pd.concat(frames, ignore_index=True)
+
+
+def load_dataset(data_folder="data/", workers=None, chunksize=None):
+    """Read every building CSV in data_folder into one frame.
+
+    Files are read in parallel by a pool of `workers` processes (all CPUs
+    by default; 1 reads them in this process). With `chunksize`, each
+    file is parsed that many rows at a time, which keeps the text parser's
+    memory bounded for very large files.
+    """
+    files = sorted(Path(data_folder).glob("*.csv"))
 
     if not files:
         print("No CSV files found in /data/ folder!")
         return pd.DataFrame()
 
-    for file in files:
-        try:
-            df = pd.read_csv(file, on_bad_lines="skip")
-            df["building"] = file.stem
+    buildings = [f.stem for f in files]
+    df_combined = _combine(_read_files(files, buildings, workers, chunksize), buildings)
+    if not df_combined.empty:
+        print("Data Loaded Successfully!")
+    return df_combined
 
-            # Standardize column names
-            df.columns = df.columns.str.lower()
 
-            combined.append(df)
+# ============================================================
+# CACHE OF CLEANED DATA
+# ============================================================
+# Each building's cleaned frame is kept in a columnar file under
+# CACHE_DIR, next to a manifest recording the size, mtime and hash of the
+# CSV it came from. Only CSVs whose fingerprint changed are parsed again.
+
+CACHE_DIR = Path(".energy_cache")
+# Bump when the cleaned frame changes shape, to ignore old caches.
+CACHE_VERSION = 1
+
+
+def _file_hash(file, block_size=1 << 20):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file, "rb") as f:
+        while block := f.read(block_size):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _fingerprint(file, cached=None):
+    """Size, mtime and hash of file.
+
+    The hash is reused from `cached` when size and mtime match it, so
+    unchanged files are never read; a file that was only touched is
+    hashed and still counts as unchanged.
+    """
+    st = file.stat()
+    entry = {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+    if cached and all(cached.get(k) == v for k, v in entry.items()):
+        entry["hash"] = cached["hash"]
+    else:
+        entry["hash"] = _file_hash(file)
+    return entry
+
+
+def _read_manifest(cache_dir):
+    try:
+        manifest = json.loads((cache_dir / "manifest.json").read_text())
+    except (FileNotFoundError, ValueError):
+        return {}
+    if manifest.get("version") != CACHE_VERSION:
+        return {}
+    return manifest.get("files", {})
+
+
+def _write_manifest(cache_dir, files):
+    tmp = cache_dir / "manifest.json.tmp"
+    tmp.write_text(json.dumps({"version": CACHE_VERSION, "files": files}, indent=1))
+    os.replace(tmp, cache_dir / "manifest.json")
+
+
+def write_frame(df, path):
+    """Write df in the format named by the path's suffix (.parquet, .feather or .csv).
+
+    Parquet and Feather need pyarrow; without it the frame is written
+    as CSV instead. Returns the path actually written.
+    """
+    path = Path(path)
+    try:
+        if path.suffix == ".parquet":
+            df.to_parquet(path, index=False)
+            return path
+        if path.suffix == ".feather":
+            df.reset_index(drop=True).to_feather(path)
+            return path
+    except ImportError:
+        print(f"pyarrow is not installed; writing CSV instead of {path.suffix}")
+        path = path.with_suffix(".csv")
+    df.to_csv(path, index=False)
+    return path
+
+
+def _write_cached(df, path):
+    try:
+        df.to_parquet(path, index=False)
+    except ImportError:
+        # Without pyarrow, a pickle keeps the dtypes just as well.
+        path = path.with_suffix(".pkl")
+        df.to_pickle(path)
+    return path
+
+
+def _read_cached(path):
+    if path.suffix == ".parquet":
+        return pd.read_parquet(path)
+    return pd.read_pickle(path)
+
+
+def load_dataset_cached(data_folder="data/", cache_dir=CACHE_DIR, workers=None, chunksize=None):
+    """Like load_dataset, but reuse cleaned frames of CSVs that haven't changed."""
+    files = sorted(Path(data_folder).glob("*.csv"))
+    if not files:
+        print("No CSV files found in /data/ folder!")
+        return pd.DataFrame()
 
-        except FileNotFoundError:
-            print(f"File not found: {file}")
-        except Exception as e:
-            print(f"Error reading {file}: {e}")
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    manifest = _read_manifest(cache_dir)
+    buildings = [f.stem for f in files]
 
-    df_combined = pd.concat(combined, ignore_index=True)
-    print("Data Loaded Successfully!")
+    entries = {}
+    stale = []
+    for file in files:
+        cached = manifest.get(file.name)
+        entry = _fingerprint(file, cached)
+        if cached and cached["hash"] == entry["hash"] and (cache_dir / cached["cache"]).exists():
+            entry["cache"] = cached["cache"]
+        else:
+            stale.append(file)
+        entries[file.name] = entry
+
+    if stale:
+        print(f"Reading {len(stale)} new or changed file(s), {len(files) - len(stale)} from cache")
+    for file, df in zip(stale, _read_files(stale, buildings, workers, chunksize)):
+        if df is None:
+            del entries[file.name]
+            continue
+        entries[file.name]["cache"] = _write_cached(df, cache_dir / f"{file.stem}.parquet").name
+
+    # Drop cache files of CSVs that were removed or replaced.
+    kept = {entry["cache"] for entry in entries.values()}
+    for name in {entry.get("cache") for entry in manifest.values()} - kept:
+        if name:
+            (cache_dir / name).unlink(missing_ok=True)
+    _write_manifest(cache_dir, entries)
+
+    frames = [_read_cached(cache_dir / entries[f.name]["cache"]) for f in files if f.name in entries]
+    df_combined = _combine(frames, buildings)
+    if not df_combined.empty:
+        print("Data Loaded Successfully!")
     return df_combined
 
 
@@ -45,7 +308,8 @@ def load_dataset():
 # ============================================================
 
 def calculate_daily_totals(df):
-    df["timestamp"] = pd.to_datetime(df["timestamp"])
+    # Parse into a copy; the caller's frame is left as it was.
+    df = df.assign(timestamp=pd.to_datetime(df["timestamp"]))
     return df.resample("D", on="timestamp")["kwh"].sum()
 
 
@@ -62,21 +326,87 @@ def building_summary(df):
 # ============================================================
 
 class MeterReading:
+    __slots__ = ("timestamp", "kwh")
+
     def __init__(self, timestamp, kwh):
         self.timestamp = timestamp
         self.kwh = kwh
 
 
 class Building:
-    def __init__(self, name):
+    """A building's readings, stored in two growing NumPy arrays.
+
+    Timestamps are datetime64[ns] and kWh float64, so a reading costs 16
+    bytes instead of a Python object, and totals are computed by NumPy.
+    """
+
+    def __init__(self, name, capacity=1024):
         self.name = name
-        self.meter_readings = []
+        self._timestamps = np.empty(capacity, dtype="datetime64[ns]")
+        self._kwh = np.empty(capacity, dtype=np.float64)
+        self._size = 0
+        self._total = None
+
+    @classmethod
+    def from_frame(cls, name, df):
+        """Build from a frame with timestamp and kwh columns, without copying row by row."""
+        building = cls(name, capacity=0)
+        building.add_readings(df["timestamp"], df["kwh"])
+        return building
+
+    def __len__(self):
+        return self._size
+
+    def _reserve(self, extra):
+        needed = self._size + extra
+        if needed <= len(self._kwh):
+            return
+        # Grow geometrically so appends are amortized O(1).
+        capacity = max(needed, 2 * len(self._kwh), 16)
+        self._timestamps = np.resize(self._timestamps, capacity)
+        self._kwh = np.resize(self._kwh, capacity)
 
     def add_reading(self, reading):
-        self.meter_readings.append(reading)
+        self._reserve(1)
+        self._timestamps[self._size] = np.datetime64(pd.Timestamp(reading.timestamp), "ns")
+        self._kwh[self._size] = reading.kwh
+        self._size += 1
+        self._total = None
+
+    def add_readings(self, timestamps, kwh):
+        """Append many readings at once from array-likes of equal length."""
+        timestamps = np.asarray(pd.to_datetime(timestamps), dtype="datetime64[ns]")
+        kwh = np.asarray(kwh, dtype=np.float64)
+        if len(timestamps) != len(kwh):
+            raise ValueError("timestamps and kwh must have the same length")
+        self._reserve(len(kwh))
+        end = self._size + len(kwh)
+        self._timestamps[self._size:end] = timestamps
+        self._kwh[self._size:end] = kwh
+        self._size = end
+        self._total = None
+
+    @property
+    def timestamps(self):
+        return self._timestamps[:self._size]
+
+    @property
+    def kwh(self):
+        return self._kwh[:self._size]
+
+    @property
+    def meter_readings(self):
+        """The readings as a tuple of MeterReading objects, built on each access.
+
+        Read-only: add readings with add_reading() or add_readings().
+        A tuple makes meter_readings.append() fail instead of losing data.
+        """
+        return tuple(MeterReading(pd.Timestamp(t), float(k)) for t, k in zip(self.timestamps, self.kwh))
 
     def total_consumption(self):
-        return sum(r.kwh for r in self.meter_readings)
+        if self._total is None:
+            self._total = float(self.kwh.sum())
+        return self._total
 
     def generate_report(self):
         return f"{self.name} consumed {self.total_consumption()} kWh"
@@ -86,10 +416,19 @@ class BuildingManager:
     def __init__(self):
         self.buildings = {}
 
+    @classmethod
+    def from_frame(cls, df):
+        """One Building per value of df["building"], filled in bulk."""
+        manager = cls()
+        for name, group in df.groupby("building", observed=True, sort=False):
+            manager.add_building(Building.from_frame(name, group))
+        return manager
+
     def add_building(self, building):
         self.buildings[building.name] = building
 
     def get_total_campus_consumption(self):
+        # Each building caches its own total until it gets new readings.
         return sum(b.total_consumption() for b in self.buildings.values())
 
 
@@ -97,39 +436,114 @@ class BuildingManager:
 # TASK 4: VISUAL DASHBOARD (MATPLOTLIB)
 # ============================================================
 
-def create_dashboard(daily, weekly, df):
+# Above this many readings the scatter plot is drawn as a density map.
+SCATTER_LIMIT = 50_000
+
+
+def lttb(x, y, n_out):
+    """Indices of n_out points that keep the shape of the (x, y) line.
+
+    Largest-Triangle-Three-Buckets: the first and last points are kept,
+    and from each bucket in between the point forming the largest
+    triangle with the previous pick and the next bucket's average.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_x = x[end:edges[i + 2]].mean()
+            next_y = y[end:edges[i + 2]].mean()
+        else:
+            next_x, next_y = x[-1], y[-1]
+        area = np.abs((x[a] - next_x) * (y[start:end] - y[a])
+                      - (x[a] - x[start:end]) * (next_y - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def _pixel_budget(ax):
+    """Points worth drawing on ax: two per horizontal pixel."""
+    return max(int(ax.get_window_extent().width) * 2, 3)
+
+
+def create_dashboard(daily, weekly, df, fast=True, output="dashboard.png"):
+    """Draw the three charts into output.
+
+    With fast=True (the default) the daily line is reduced to the
+    axis's pixel budget with LTTB, weekly bars share a date axis instead
+    of one label per bar, and large scatters become a density map.
+    fast=False draws every point, as before.
+    """
+    # Imported here so the analysis runs without a display or a slow
+    # pyplot import; Agg only writes image files.
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.dates as mdates
+    import matplotlib.pyplot as plt
+
     fig, ax = plt.subplots(1, 3, figsize=(15, 5))
 
     # Plot 1: Daily Line Chart
-    ax[0].plot(daily.index, daily.values)
+    if fast:
+        keep = lttb(daily.index.asi8, daily.values, _pixel_budget(ax[0]))
+        ax[0].plot(daily.index[keep], daily.values[keep])
+    else:
+        ax[0].plot(daily.index, daily.values)
     ax[0].set_title("Daily Energy Consumption")
     ax[0].set_xlabel("Date")
     ax[0].set_ylabel("kWh")
 
     # Plot 2: Weekly Bar Chart
-    ax[1].bar(weekly.index.astype(str), weekly.values)
+    if fast:
+        ax[1].bar(weekly.index, weekly.values, width=6)
+    else:
+        ax[1].bar(weekly.index.astype(str), weekly.values)
     ax[1].set_title("Weekly Energy Usage")
     ax[1].set_xlabel("Week")
     ax[1].set_ylabel("kWh")
     ax[1].tick_params(axis='x', rotation=45)
 
     # Plot 3: Scatter Chart
-    ax[2].scatter(df["timestamp"], df["kwh"])
+    if fast and len(df) > SCATTER_LIMIT:
+        timestamps = mdates.date2num(df["timestamp"].to_numpy())
+        ax[2].hexbin(timestamps, df["kwh"].to_numpy(), gridsize=(120, 60), bins="log", mincnt=1)
+        ax[2].xaxis_date()
+    else:
+        ax[2].scatter(df["timestamp"], df["kwh"])
     ax[2].set_title("Scatter: Timestamp vs kWh")
     ax[2].set_xlabel("Timestamp")
     ax[2].set_ylabel("kWh")
 
     plt.tight_layout()
-    plt.savefig("dashboard.png")
-    print("Dashboard saved as dashboard.png")
+    plt.savefig(output)
+    plt.close(fig)
+    print(f"Dashboard saved as {output}")
 
 
 # ============================================================
 # TASK 5: EXPORT DATA + SUMMARY REPORT
 # ============================================================
 
-def save_outputs(df, summary, daily, weekly):
-    df.to_csv("cleaned_energy_data.csv", index=False)
+def save_outputs(df, summary, daily, weekly, export_format="parquet", anomalies=None):
+    # Columnar formats keep the dtypes and read back much faster than CSV.
+    # export_format=None skips the cleaned data.
+    saved = []
+    if export_format:
+        saved.append(write_frame(df, f"cleaned_energy_data.{export_format}"))
+    if anomalies is not None:
+        building_anomalies, found, peaks = anomalies
+        summary = summary.join(building_anomalies)
+        found.to_csv("anomalies.csv", index=False)
     summary.to_csv("building_summary.csv")
 
     total_consumption = df["kwh"].sum()
@@ -145,39 +559,138 @@ def save_outputs(df, summary, daily, weekly):
         f"\nDaily Trend: Saved in dashboard.png\n"
         f"Weekly Trend: Saved in dashboard.png\n"
     )
+    if anomalies is not None:
+        report_text += anomaly_report(building_anomalies, found, peaks)
 
     with open("summary.txt", "w") as f:
         f.write(report_text)
 
+    saved += ["building_summary.csv", "summary.txt"]
+    if anomalies is not None:
+        saved.append("anomalies.csv")
     print("Output files saved:")
-    print("- cleaned_energy_data.csv")
-    print("- building_summary.csv")
-    print("- summary.txt")
+    for name in saved:
+        print(f"- {name}")
+
+
+def anomaly_report(building_anomalies, found, peaks, top=10):
+    """Peak and anomaly section of summary.txt."""
+    counts = found["kind"].value_counts()
+    lines = [
+        "",
+        "Peaks and Anomalies",
+        "---------------------------",
+        f"Campus Baseload: {building_anomalies['baseload_kwh'].sum():.2f} kWh per reading",
+        f"Spikes: {counts.get('spike', 0)}  Flatlines: {counts.get('flatline', 0)}  "
+        f"Gaps: {counts.get('gap', 0)}  (listed in anomalies.csv)",
+        "",
+        f"Top {top} Peak Windows:",
+    ]
+    best = peaks.nlargest(top, "mean_kwh")
+    for row in best.itertuples():
+        lines.append(f"  {row.building}: {row.mean_kwh:.2f} kWh/reading, {row.start} to {row.end}")
+
+    flagged = building_anomalies[["spikes", "flatlines", "gaps"]].sum(axis=1)
+    flagged = flagged[flagged > 0].nlargest(top)
+    if len(flagged):
+        lines += ["", "Buildings With Most Anomalies:"]
+        lines += [f"  {name}: {count}" for name, count in flagged.items()]
+    return "\n".join(lines) + "\n"
 
 
 # ============================================================
 # MAIN EXECUTION
 # ============================================================
 
-def main():
-    df = load_dataset()
+# Running daily buckets used by --incremental (see energy_aggregator.py).
+STATE_FILE = Path("energy_state.db")
+
+
+COMMANDS = ["run", "stats", "plot", "export"]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Campus energy analysis",
+        epilog="Without a command, 'run' is assumed.")
+    commands = parser.add_subparsers(dest="command")
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--no-cache", action="store_true",
+                        help=f"re-read every CSV instead of using {CACHE_DIR}/")
+    totals = argparse.ArgumentParser(add_help=False)
+    totals.add_argument("--incremental", action="store_true",
+                        help=f"fold only new readings into {STATE_FILE} for the totals")
+    totals.add_argument("--rebuild-state", action="store_true",
+                        help=f"recompute {STATE_FILE} from all readings (implies --incremental)")
+    export = argparse.ArgumentParser(add_help=False)
+    export.add_argument("--export-format", choices=["parquet", "feather", "csv"],
+                        default="parquet", help="format of the cleaned data export")
+    plot = argparse.ArgumentParser(add_help=False)
+    plot.add_argument("--full-dashboard", action="store_true",
+                      help="plot every reading instead of a downsampled view")
+
+    commands.add_parser("run", parents=[common, totals, export, plot],
+                        help="everything below (the default)")
+    commands.add_parser("stats", parents=[common, totals],
+                        help="building_summary.csv, summary.txt and anomalies.csv")
+    commands.add_parser("plot", parents=[common, totals, plot], help="dashboard.png")
+    commands.add_parser("export", parents=[common, export], help="the cleaned data")
+
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv or (argv[0] not in COMMANDS and argv[0] not in ("-h", "--help")):
+        argv = ["run"] + argv
+    return parser.parse_args(argv)
+
+
+def aggregate(df, args):
+    """Daily totals, weekly totals and building summary, from scratch or incrementally."""
+    if not (args.incremental or args.rebuild_state):
+        return calculate_daily_totals(df), calculate_weekly_totals(df), building_summary(df)
+
+    from energy_aggregator import EnergyAggregator
+
+    with EnergyAggregator(STATE_FILE) as aggregator:
+        if args.rebuild_state:
+            aggregator.rebuild(df)
+        else:
+            added = aggregator.update(df)
+            print(f"Aggregated {added} new reading(s)")
+        return aggregator.daily_totals(), aggregator.weekly_totals(), aggregator.building_summary()
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.no_cache:
+        df = load_dataset()
+    else:
+        df = load_dataset_cached()
     if df.empty:
         return
 
+    if args.command == "export":
+        print(f"Saved {write_frame(df, f'cleaned_energy_data.{args.export_format}')}")
+        return
+
     # Aggregations
-    daily = calculate_daily_totals(df)
-    weekly = calculate_weekly_totals(df)
-    summary = building_summary(df)
+    daily, weekly, summary = aggregate(df, args)
 
     # Dashboard
-    create_dashboard(daily, weekly, df)
+    if args.command in ("run", "plot"):
+        create_dashboard(daily, weekly, df, fast=not args.full_dashboard)
 
-    # Output Files
-    save_outputs(df, summary, daily, weekly)
+    if args.command in ("run", "stats"):
+        from energy_anomalies import detect_anomalies
+
+        # Peaks and anomalies, one pass per building
+        anomalies = detect_anomalies(df)
+
+        # Output Files
+        export_format = args.export_format if args.command == "run" else None
+        save_outputs(df, summary, daily, weekly, export_format, anomalies)
 
     print("\nScript Completed Successfully!")
 
 
 if __name__ == "__main__":
     main()
-
@@ -0,0 +1,169 @@
+# ======================================
+# PEAK LOAD AND ANOMALY DETECTION
+# ======================================
+# Per-building peak windows, baseload, and flagged anomalies:
+#   spike     a reading far from the rolling mean of the readings before it
+#   flatline  the same value reported many times in a row (stuck meter)
+#   gap       readings missing for much longer than the usual interval
+# Each building is handled in one pass of NumPy array operations.
+
+import numpy as np
+import pandas as pd
+
+
+# Defaults, tuned for 15-minute readings.
+SETTINGS = {
+    "window": 96,              # readings in the rolling window (a day)
+    "z_threshold": 4.0,        # |z| above this is a spike
+    "flat_run": 16,            # identical readings in a row that count as a flatline
+    "gap_factor": 3.0,         # a gap is this many times the usual interval
+    "peak_window": 4,          # readings per peak window (an hour)
+    "top_k": 3,                # peak windows kept per building
+    "baseload_quantile": 0.05,
+}
+
+
+def rolling_zscores(kwh, window):
+    """z-score of each reading against the `window` readings before it.
+
+    Uses running sums, so the cost doesn't depend on the window size.
+    Readings without a full window before them, or with a constant
+    window, get 0.
+    """
+    n = len(kwh)
+    z = np.zeros(n)
+    if n <= window:
+        return z
+    # Centring first keeps the running sums small and the variance accurate.
+    x = kwh - kwh.mean()
+    c1 = np.concatenate(([0.0], np.cumsum(x)))
+    c2 = np.concatenate(([0.0], np.cumsum(x * x)))
+    mean = (c1[window:n] - c1[:n - window]) / window
+    var = (c2[window:n] - c2[:n - window]) / window - mean * mean
+    std = np.sqrt(np.clip(var, 0, None))
+    ok = std > 1e-9 * (np.abs(mean) + 1)
+    z[window:][ok] = (x[window:][ok] - mean[ok]) / std[ok]
+    return z
+
+
+def _runs(values):
+    """Start index and length of each run of equal consecutive values."""
+    change = np.flatnonzero(values[1:] != values[:-1]) + 1
+    starts = np.concatenate(([0], change))
+    lengths = np.diff(np.concatenate((starts, [len(values)])))
+    return starts, lengths
+
+
+def top_windows(kwh, width, k):
+    """Start indices of the k non-overlapping `width`-reading windows with the most kWh.
+
+    Candidates are picked with argpartition, so only a few are sorted.
+    """
+    n = len(kwh)
+    if n < width:
+        return np.array([], dtype=np.int64), np.array([])
+    c = np.concatenate(([0.0], np.cumsum(kwh)))
+    sums = c[width:] - c[:-width]
+    # Overlapping windows crowd the top, so take enough candidates that
+    # k non-overlapping ones are among them.
+    pool = min(len(sums), k * (2 * width - 1))
+    candidates = np.argpartition(sums, len(sums) - pool)[len(sums) - pool:]
+    candidates = candidates[np.argsort(-sums[candidates], kind="stable")]
+
+    chosen = []
+    for start in candidates:
+        if all(abs(start - other) >= width for other in chosen):
+            chosen.append(start)
+            if len(chosen) == k:
+                break
+    chosen = np.array(chosen, dtype=np.int64)
+    return chosen, sums[chosen] / width
+
+
+def analyze_building(name, timestamps, kwh, **settings):
+    """Peaks, baseload and anomalies for one building's readings.
+
+    settings override SETTINGS. Returns (summary row dict, anomalies
+    frame, peaks frame).
+    """
+    settings = {**SETTINGS, **settings}
+    order = np.argsort(timestamps, kind="stable")
+    timestamps = np.asarray(timestamps)[order]
+    kwh = np.asarray(kwh, dtype=np.float64)[order]
+    n = len(kwh)
+
+    # Spikes
+    z = rolling_zscores(kwh, settings["window"])
+    spike_idx = np.flatnonzero(np.abs(z) > settings["z_threshold"])
+
+    # Flatlines
+    starts, lengths = _runs(kwh)
+    flat = lengths >= settings["flat_run"]
+    flat_idx, flat_len = starts[flat], lengths[flat]
+
+    # Gaps, measured against the usual reading interval
+    steps = np.diff(timestamps).astype("timedelta64[s]").astype(np.float64)
+    interval = np.median(steps) if len(steps) else 0.0
+    if interval > 0:
+        gap_idx = np.flatnonzero(steps > settings["gap_factor"] * interval)
+    else:
+        gap_idx = np.array([], dtype=np.int64)
+
+    # Peak windows and baseload
+    peak_starts, peak_means = top_windows(kwh, settings["peak_window"], settings["top_k"])
+    baseload = float(np.quantile(kwh, settings["baseload_quantile"])) if n else np.nan
+    peak_i = int(np.argmax(kwh)) if n else None
+
+    anomalies = pd.DataFrame({
+        "building": name,
+        "timestamp": np.concatenate((timestamps[spike_idx], timestamps[flat_idx], timestamps[gap_idx])),
+        "kind": ["spike"] * len(spike_idx) + ["flatline"] * len(flat_idx) + ["gap"] * len(gap_idx),
+        "kwh": np.concatenate((kwh[spike_idx], kwh[flat_idx], kwh[gap_idx])),
+        # z-score for spikes, readings in the run for flatlines, hours missing for gaps
+        "score": np.concatenate((z[spike_idx], flat_len.astype(np.float64), steps[gap_idx] / 3600)),
+    })
+    peaks = pd.DataFrame({
+        "building": name,
+        "rank": np.arange(1, len(peak_starts) + 1),
+        "start": timestamps[peak_starts],
+        "end": timestamps[peak_starts + settings["peak_window"] - 1],
+        "mean_kwh": peak_means,
+    })
+    summary = {
+        "building": name,
+        "baseload_kwh": baseload,
+        "peak_kwh": kwh[peak_i] if n else np.nan,
+        "peak_time": timestamps[peak_i] if n else pd.NaT,
+        "peak_window_start": peaks["start"].iloc[0] if len(peaks) else pd.NaT,
+        "peak_window_kwh": peaks["mean_kwh"].iloc[0] if len(peaks) else np.nan,
+        "spikes": len(spike_idx),
+        "flatlines": len(flat_idx),
+        "gaps": len(gap_idx),
+    }
+    return summary, anomalies, peaks
+
+
+def detect_anomalies(df, **settings):
+    """Analyze every building in df (timestamp, kwh and building columns).
+
+    Returns three frames:
+        summary    one row per building: baseload, peak reading, best
+                   peak window, and counts of each kind of anomaly
+        anomalies  building, timestamp, kind, kwh, score
+        peaks      building, rank, start, end, mean_kwh of the top windows
+    """
+    summaries, anomalies, peaks = [], [], []
+    for name, group in df.groupby("building", observed=True, sort=True):
+        row, found, top = analyze_building(
+            name, group["timestamp"].to_numpy(), group["kwh"].to_numpy(), **settings)
+        summaries.append(row)
+        anomalies.append(found)
+        peaks.append(top)
+    if not summaries:
+        return pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
+
+    summary = pd.DataFrame(summaries).set_index("building")
+    anomalies = pd.concat(anomalies, ignore_index=True).sort_values(
+        ["building", "timestamp"], ignore_index=True)
+    peaks = pd.concat(peaks, ignore_index=True)
+    return summary, anomalies, peaks
@@ -0,0 +1,256 @@
+# ======================================
+# BINARY TIME-SERIES STORE
+# ======================================
+# One file per building (or weather station) holding fixed-width
+# records: an int64 timestamp in nanoseconds followed by one float per
+# value column. Records are appended in time order. Every INDEX_EVERY-th
+# timestamp is also written to a small "<file>.idx" sidecar, so a date
+# range query finds its records with a binary search in that index and
+# reads only those pages of the data file through numpy.memmap.
+#
+# Convert CSVs (building and weather layouts both work):
+#   python series_store.py convert data/*.csv --out store/
+# Query:
+#   python series_store.py query store/buildingA.tsb 2025-01-01 2025-01-02
+
+import argparse
+import json
+from pathlib import Path
+
+import numpy as np
+
+MAGIC = b"TSB1"
+# Records start on a page boundary after the header.
+HEADER_SIZE = 4096
+INDEX_EVERY = 1024
+SUFFIX = ".tsb"
+
+
+def _record_dtype(fields, value_dtype):
+    return np.dtype([("timestamp", "<i8")] + [(name, "<" + value_dtype) for name in fields])
+
+
+def _read_header(path):
+    with open(path, "rb") as f:
+        header = f.read(HEADER_SIZE)
+    if len(header) < HEADER_SIZE or header[:4] != MAGIC:
+        raise ValueError(f"{path} is not a series file")
+    length = int.from_bytes(header[4:8], "little")
+    return json.loads(header[8:8 + length])
+
+
+def _to_ns(timestamps):
+    return np.asarray(timestamps, dtype="datetime64[ns]").astype(np.int64)
+
+
+class SeriesWriter:
+    """Appends records to a series file, creating it if needed."""
+
+    def __init__(self, path, fields=None, value_dtype="f4"):
+        self.path = Path(path)
+        self.index_path = self.path.with_name(self.path.name + ".idx")
+        if self.path.exists():
+            meta = _read_header(self.path)
+            if fields is not None and list(fields) != meta["fields"]:
+                raise ValueError(f"{self.path} holds {meta['fields']}, not {list(fields)}")
+        else:
+            if not fields:
+                raise ValueError("fields are needed to create a series file")
+            meta = {"fields": list(fields), "value_dtype": value_dtype}
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            blob = json.dumps(meta).encode()
+            with open(self.path, "wb") as f:
+                f.write(MAGIC + len(blob).to_bytes(4, "little") + blob)
+                f.write(b"\0" * (HEADER_SIZE - 8 - len(blob)))
+            self.index_path.write_bytes(b"")
+        self.fields = meta["fields"]
+        self.dtype = _record_dtype(self.fields, meta["value_dtype"])
+        self._recover()
+
+    def _recover(self):
+        """Cut off a half-written record and rebuild the index if it lags."""
+        size = self.path.stat().st_size - HEADER_SIZE
+        self.count = size // self.dtype.itemsize
+        if size % self.dtype.itemsize:
+            with open(self.path, "r+b") as f:
+                f.truncate(HEADER_SIZE + self.count * self.dtype.itemsize)
+
+        self.last = None
+        if self.count:
+            data = np.memmap(self.path, dtype=self.dtype, mode="r", offset=HEADER_SIZE)
+            self.last = int(data["timestamp"][-1])
+            expected = (self.count + INDEX_EVERY - 1) // INDEX_EVERY
+            index = np.fromfile(self.index_path, dtype="<i8") if self.index_path.exists() else []
+            if len(index) != expected:
+                np.ascontiguousarray(data["timestamp"][::INDEX_EVERY]).tofile(self.index_path)
+            del data
+
+    def append(self, timestamps, values):
+        """Append readings. values maps each field to an array (or is a 2-D array).
+
+        Timestamps must not go back before the last record already stored.
+        """
+        ts = _to_ns(timestamps)
+        if not len(ts):
+            return 0
+        if np.any(np.diff(ts) < 0) or (self.last is not None and ts[0] < self.last):
+            raise ValueError("readings must be appended in time order")
+
+        records = np.empty(len(ts), dtype=self.dtype)
+        records["timestamp"] = ts
+        if isinstance(values, dict):
+            for name in self.fields:
+                records[name] = values[name]
+        else:
+            values = np.asarray(values).reshape(len(ts), len(self.fields))
+            for i, name in enumerate(self.fields):
+                records[name] = values[:, i]
+
+        # Index entries for record numbers that are multiples of INDEX_EVERY.
+        first = -self.count % INDEX_EVERY
+        new_index = ts[first::INDEX_EVERY]
+
+        with open(self.path, "ab") as f:
+            records.tofile(f)
+        with open(self.index_path, "ab") as f:
+            new_index.tofile(f)
+        self.count += len(ts)
+        self.last = int(ts[-1])
+        return len(ts)
+
+    def truncate(self, count):
+        """Drop every record after the first count, e.g. to undo a failed import."""
+        with open(self.path, "r+b") as f:
+            f.truncate(HEADER_SIZE + count * self.dtype.itemsize)
+        with open(self.index_path, "r+b") as f:
+            f.truncate((count + INDEX_EVERY - 1) // INDEX_EVERY * 8)
+        self._recover()
+
+
+class SeriesReader:
+    """Read-only view of a series file through numpy.memmap."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        meta = _read_header(self.path)
+        self.fields = meta["fields"]
+        self.dtype = _record_dtype(self.fields, meta["value_dtype"])
+        count = (self.path.stat().st_size - HEADER_SIZE) // self.dtype.itemsize
+        if count:
+            self.records = np.memmap(self.path, dtype=self.dtype, mode="r",
+                                     offset=HEADER_SIZE, shape=(count,))
+        else:
+            # numpy can't map an empty range.
+            self.records = np.empty(0, dtype=self.dtype)
+        # The sparse index is small enough to read whole.
+        index_path = self.path.with_name(self.path.name + ".idx")
+        self.index = np.fromfile(index_path, dtype="<i8")
+
+    def __len__(self):
+        return len(self.records)
+
+    def _position(self, ts, side):
+        """Record number where ts would go, touching one index block of the data."""
+        block = np.searchsorted(self.index, ts, side=side)
+        lo = max(block - 1, 0) * INDEX_EVERY
+        hi = min(block * INDEX_EVERY + 1, len(self.records))
+        return lo + int(np.searchsorted(self.records["timestamp"][lo:hi], ts, side=side))
+
+    def range(self, start=None, end=None):
+        """Records with start <= timestamp < end, as a structured array view."""
+        lo = 0 if start is None else self._position(_to_ns(start), "left")
+        hi = len(self.records) if end is None else self._position(_to_ns(end), "left")
+        return self.records[lo:max(lo, hi)]
+
+    def timestamps(self, records):
+        return records["timestamp"].view("datetime64[ns]")
+
+
+def _time_column(columns):
+    for name in columns:
+        if name.lower() in ("timestamp", "date", "time", "datetime"):
+            return name
+    raise ValueError("no timestamp or date column")
+
+
+def convert_csv(csv_path, out_path, value_dtype="f4", chunksize=1_000_000):
+    """Append a CSV's readings to a series file. Returns the number of records.
+
+    The first timestamp/date column is the time; every other numeric
+    column becomes a field. Rows already in the series (by time) are
+    skipped, so converting a growing CSV again appends only new rows.
+
+    The CSV is read in chunks and must be in time order across them.
+    If a chunk goes back before the rows already converted, ValueError
+    is raised and the series is left as it was before the call.
+    """
+    import pandas as pd
+
+    header = pd.read_csv(csv_path, nrows=100)
+    time_col = _time_column(header.columns)
+    fields = [c for c in header.columns if c != time_col
+              and pd.api.types.is_numeric_dtype(header[c])]
+    writer = SeriesWriter(out_path, [f.lower() for f in fields], value_dtype)
+
+    # Only rows up to what was stored before this call count as already
+    # converted; anything else going back in time means the CSV is unsorted.
+    stored, watermark = writer.count, writer.last
+    total = 0
+    try:
+        with pd.read_csv(csv_path, usecols=[time_col] + fields, parse_dates=[time_col],
+                         chunksize=chunksize, on_bad_lines="skip") as reader:
+            for chunk in reader:
+                chunk = chunk.dropna(subset=[time_col]).sort_values(time_col, kind="stable")
+                ts = chunk[time_col].to_numpy(dtype="datetime64[ns]")
+                if watermark is not None:
+                    keep = _to_ns(ts) > watermark
+                    chunk, ts = chunk[keep], ts[keep]
+                if len(ts) and writer.last is not None and _to_ns(ts[0]) < writer.last:
+                    raise ValueError(
+                        f"{csv_path} is not in time order: rows from {pd.Timestamp(ts[0])} "
+                        f"come after {pd.Timestamp(writer.last)}; sort it by {time_col} first")
+                values = {f.lower(): pd.to_numeric(chunk[f], errors="coerce").to_numpy()
+                          for f in fields}
+                total += writer.append(ts, values)
+    except Exception:
+        writer.truncate(stored)
+        raise
+    return total
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Binary time-series store")
+    sub = parser.add_subparsers(dest="command", required=True)
+    convert = sub.add_parser("convert", help="convert CSV files to series files")
+    convert.add_argument("csv", nargs="+")
+    convert.add_argument("--out", default="store")
+    convert.add_argument("--dtype", choices=["f4", "f8"], default="f4",
+                         help="value precision (default float32)")
+    query = sub.add_parser("query", help="print the records in a time range")
+    query.add_argument("series")
+    query.add_argument("start", nargs="?")
+    query.add_argument("end", nargs="?")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.command == "convert":
+        for csv_path in args.csv:
+            out_path = Path(args.out) / (Path(csv_path).stem + SUFFIX)
+            try:
+                added = convert_csv(csv_path, out_path, args.dtype)
+            except ValueError as e:
+                print(f"Error converting {csv_path}: {e}")
+                continue
+            print(f"{csv_path} -> {out_path}: {added} new record(s)")
+    else:
+        reader = SeriesReader(args.series)
+        records = reader.range(args.start, args.end)
+        print("timestamp," + ",".join(reader.fields))
+        for ts, row in zip(reader.timestamps(records), records):
+            print(f"{ts}," + ",".join(str(row[f]) for f in reader.fields))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+# Meal log for the Daily Calorie Tracker
+#
+# Every meal is appended to meals.jsonl as one JSON record:
+#   {"time": "2025-11-10T19:51:06", "meal": "Lunch", "calories": 350.0}
+# Nothing in that file is ever rewritten. Per-day and per-week totals
+# are kept in meal_rollups.json together with how far into the log they
+# go, so each new meal only updates its own day and week, and reports
+# over years of history read the rollups instead of every meal.
+#
+# Report:   python meal_log.py report --days 7 --weeks 8 --limit 2000
+# Rebuild:  python meal_log.py rebuild
+
+import argparse
+import datetime
+import json
+import os
+from pathlib import Path
+
+LOG_FILE = "meals.jsonl"
+ROLLUP_FILE = "meal_rollups.json"
+
+
+def week_of(day):
+    """ISO week key of a date, e.g. '2025-W46'."""
+    year, week, _ = day.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def _fold(bucket, calories):
+    if bucket is None:
+        return {"meals": 1, "calories": calories, "min": calories, "max": calories}
+    bucket["meals"] += 1
+    bucket["calories"] += calories
+    bucket["min"] = min(bucket["min"], calories)
+    bucket["max"] = max(bucket["max"], calories)
+    return bucket
+
+
+class MealLog:
+    """Append-only meal records with per-day and per-week rollups.
+
+    The log is the source of truth. The rollup file remembers the log
+    size it covers; if the program stopped between writing a meal and
+    saving the rollups, the missing records are folded in on the next
+    open. rebuild() recomputes everything from the log.
+    """
+
+    def __init__(self, log_file=LOG_FILE, rollup_file=None):
+        self.log_file = Path(log_file)
+        self.rollup_file = Path(rollup_file) if rollup_file else self.log_file.with_name(ROLLUP_FILE)
+        try:
+            self.rollups = json.loads(self.rollup_file.read_text())
+        except (FileNotFoundError, ValueError):
+            self.rollups = None
+        if self._log_size() < (self.rollups or {}).get("offset", 0):
+            # The log was replaced or cut short; the rollups don't match it.
+            self.rollups = None
+        if self.rollups is None:
+            self.rollups = {"offset": 0, "days": {}, "weeks": {}}
+        self.catch_up()
+
+    def _log_size(self):
+        try:
+            return self.log_file.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def _apply(self, record):
+        day = datetime.datetime.fromisoformat(record["time"]).date()
+        days, weeks = self.rollups["days"], self.rollups["weeks"]
+        days[day.isoformat()] = _fold(days.get(day.isoformat()), record["calories"])
+        weeks[week_of(day)] = _fold(weeks.get(week_of(day)), record["calories"])
+
+    def _save(self):
+        tmp = self.rollup_file.with_name(self.rollup_file.name + ".tmp")
+        tmp.write_text(json.dumps(self.rollups, separators=(",", ":")))
+        os.replace(tmp, self.rollup_file)
+
+    def catch_up(self):
+        """Fold in records written after the rollups were last saved. Returns how many."""
+        offset = self.rollups["offset"]
+        if self._log_size() <= offset:
+            return 0
+        count = 0
+        with open(self.log_file, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                # A crash can leave half a record at the end.
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                self._apply(record)
+                offset += len(line)
+                count += 1
+        if offset < self._log_size():
+            # Cut it off so that new meals don't land behind it.
+            os.truncate(self.log_file, offset)
+        self.rollups["offset"] = offset
+        self._save()
+        return count
+
+    def rebuild(self):
+        """Recompute the rollups from the whole log."""
+        self.rollups = {"offset": 0, "days": {}, "weeks": {}}
+        return self.catch_up()
+
+    def add_meals(self, meals):
+        """Append (meal name, calories, time) tuples; time may be None for now."""
+        now = datetime.datetime.now()
+        records = [{"time": (when or now).isoformat(timespec="seconds"),
+                    "meal": meal, "calories": float(calories)}
+                   for meal, calories, when in meals]
+        if not records:
+            return
+        self.catch_up()
+        data = "".join(json.dumps(record) + "\n" for record in records).encode()
+        with open(self.log_file, "ab") as f:
+            f.write(data)
+        for record in records:
+            self._apply(record)
+        self.rollups["offset"] += len(data)
+        self._save()
+
+    def add(self, meal, calories, when=None):
+        self.add_meals([(meal, calories, when)])
+
+    # ----- reports -----------------------------------------------------
+
+    def day(self, day):
+        """Rollup of one date (datetime.date or 'YYYY-MM-DD'), or None."""
+        key = day if isinstance(day, str) else day.isoformat()
+        return self.rollups["days"].get(key)
+
+    def week(self, day):
+        """Rollup of the ISO week containing day, or None."""
+        if isinstance(day, str):
+            day = datetime.date.fromisoformat(day)
+        return self.rollups["weeks"].get(week_of(day))
+
+    def days(self, last=None):
+        """(date, rollup) pairs, oldest first; only the last `last` logged days if given."""
+        days = sorted(self.rollups["days"].items())
+        return days[-last:] if last else days
+
+    def weeks(self, last=None):
+        weeks = sorted(self.rollups["weeks"].items())
+        return weeks[-last:] if last else weeks
+
+
+def print_report(log, days=7, weeks=8, limit=None):
+    print("\nDate\t\tMeals\tCalories")
+    print("--------------------------------")
+    for day, r in log.days(days):
+        status = "" if limit is None else ("\tOver Limit" if r["calories"] > limit else "\tWithin Limit")
+        print(f"{day}\t{r['meals']}\t{r['calories']:.1f}{status}")
+
+    print("\nWeek\t\tMeals\tCalories\tPer Day")
+    print("--------------------------------------------")
+    for week, r in log.weeks(weeks):
+        year, number = week.split("-W")
+        logged = sum(1 for d in range(1, 8)
+                     if log.day(datetime.date.fromisocalendar(int(year), int(number), d)))
+        print(f"{week}\t{r['meals']}\t{r['calories']:.1f}\t\t{r['calories'] / logged:.1f}")
+
+    all_days = log.rollups["days"].values()
+    if all_days:
+        total = sum(r["calories"] for r in all_days)
+        print(f"\nDays logged: {len(all_days)}  Average per day: {total / len(all_days):.1f}")
+        if limit is not None:
+            over = sum(1 for r in all_days if r["calories"] > limit)
+            print(f"Days over the {limit:g} limit: {over}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Daily Calorie Tracker history")
+    parser.add_argument("--log", default=LOG_FILE)
+    sub = parser.add_subparsers(dest="command", required=True)
+    report = sub.add_parser("report", help="daily and weekly totals")
+    report.add_argument("--days", type=int, default=7, help="last N logged days (0 for all)")
+    report.add_argument("--weeks", type=int, default=8, help="last N logged weeks (0 for all)")
+    report.add_argument("--limit", type=float, help="daily calorie limit to check against")
+    sub.add_parser("rebuild", help="recompute the rollups from the meal log")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    log = MealLog(args.log)
+    if args.command == "rebuild":
+        print(f"Rebuilt rollups from {log.rebuild()} meal(s)")
+    else:
+        print_report(log, args.days, args.weeks, args.limit)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,8 +8,12 @@ print("-------------------------------------")
 
 # Calorie Tracker Program
 
+import datetime
+from meal_log import MealLog
+
 meal_names = []
 calorie_amounts = []
+meal_times = []
 
 num_meals = int(input("How many meals do you want to enter? "))
 
@@ -18,6 +22,7 @@ for i in range(num_meals):
     calories = float(input("Enter calories for " + meal + ": "))
     meal_names.append(meal)
     calorie_amounts.append(calories)
+    meal_times.append(datetime.datetime.now())
 
 #Task 1: Total and Average Calculation
 
@@ -45,14 +50,24 @@ print("--------------------------")
 print("Total:\t\t", total)
 print("Average:\t", round(average, 2))
 
+# Every meal goes into the meal log (meals.jsonl), which keeps the
+# history whether or not the report is saved; see
+# `python meal_log.py report` for daily and weekly totals.
+
+log = MealLog()
+log.add_meals(zip(meal_names, calorie_amounts, meal_times))
+today = log.day(meal_times[-1].date())
+week = log.week(meal_times[-1].date())
+print("\nToday so far:\t", today["calories"], "calories in", today["meals"], "meals")
+print("This week:\t", week["calories"], "calories in", week["meals"], "meals")
+
 # Task 4: Save Report to File
 
 save = input("\nDo you want to save this report to a file? (yes/no): ")
 
 if save.lower() == "yes":
-    import datetime
     time_now = datetime.datetime.now()
-    file = open("calorie_log.txt", "w")
+    file = open("calorie_log.txt", "a")
 
     file.write("Calorie Report - " + str(time_now) + "\n\n")
     file.write("Meal Name\tCalories\n")
@@ -69,9 +84,10 @@ if save.lower() == "yes":
         file.write("Status: Over Limit\n")
     else:
         file.write("Status: Within Limit\n")
+    file.write("\n")
 
     file.close()
-    print("Report saved as 'calorie_log.txt'")
+    print("Report added to 'calorie_log.txt'")
 else:
     print("Report not saved.")
 
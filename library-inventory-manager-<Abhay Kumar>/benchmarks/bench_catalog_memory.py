@@ -0,0 +1,68 @@
+# benchmarks/bench_catalog_memory.py
+#
+# Peak memory of loading a catalog: json.load of the whole file versus
+# the streaming loader, and plain-class books versus the slotted Book.
+# Run from the project folder:  python -m benchmarks.bench_catalog_memory [books]
+
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from library_manager.book import Book
+from library_manager.catalog_io import iter_json_array
+from benchmarks.bench_isbn_lookup import write_catalog
+
+
+class PlainBook:
+    """The old Book layout: a regular class with a __dict__ per instance."""
+
+    def __init__(self, title, author, isbn, status="available"):
+        self.title = title
+        self.author = author
+        self.isbn = isbn
+        self.status = status.lower()
+
+
+def load_whole(path, cls):
+    with open(path) as f:
+        data = json.load(f)
+    return [cls(**b) for b in data]
+
+
+def load_streaming(path, cls):
+    return [cls(**b) for b in iter_json_array(path)]
+
+
+def measure(loader, path, cls):
+    tracemalloc.start()
+    start = time.perf_counter()
+    books = loader(path, cls)
+    elapsed = time.perf_counter() - start
+    final, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del books
+    return elapsed, final, peak
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+    mb = 1024 * 1024
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "catalog.json"
+        write_catalog(path, n)
+        print(f"{n} books, {path.stat().st_size / mb:.1f} MB on disk")
+        print(f"{'loader':<28} {'time (s)':>9} {'final (MB)':>11} {'peak (MB)':>10}")
+        for name, loader, cls in [
+            ("json.load + PlainBook", load_whole, PlainBook),
+            ("json.load + Book", load_whole, Book),
+            ("streaming + Book", load_streaming, Book),
+        ]:
+            elapsed, final, peak = measure(loader, path, cls)
+            print(f"{name:<28} {elapsed:>9.2f} {final / mb:>11.1f} {peak / mb:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
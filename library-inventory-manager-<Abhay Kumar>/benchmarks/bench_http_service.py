@@ -0,0 +1,160 @@
+# benchmarks/bench_http_service.py
+#
+# Load generator for the HTTP service (python -m cli.main serve).
+# Starts the service on localhost in a separate process, then drives it
+# with many keep-alive connections and reports throughput and latency.
+# With --other-desk, another process keeps taking the catalog's write
+# lock (the lock file, or a SQLite write transaction) for that many
+# seconds at a time: writes then wait, but reads must stay fast.
+# Run from the project folder:
+#   python -m benchmarks.bench_http_service [--connections 64] [--requests 200]
+#   python -m benchmarks.bench_http_service --backend sqlite --other-desk 0.5
+
+import argparse
+import asyncio
+import json
+import multiprocessing as mp
+import random
+import socket
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from library_manager.backends import open_inventory
+from library_manager.locking import FileLock
+from library_manager.service import serve
+from benchmarks.bench_isbn_lookup import write_catalog
+
+
+def run_server(backend, catalog, port):
+    asyncio.run(serve(open_inventory(backend, catalog), "127.0.0.1", port))
+
+
+def other_desk(backend, catalog, hold, stop):
+    """Another process sharing the catalog, holding its write lock `hold` seconds at a time."""
+    if backend == "sqlite":
+        conn = sqlite3.connect(catalog, isolation_level=None)
+        while not stop.is_set():
+            conn.execute("BEGIN IMMEDIATE")
+            time.sleep(hold)
+            conn.execute("COMMIT")
+            time.sleep(hold / 10)
+        conn.close()
+    else:
+        lock = FileLock(Path(catalog).with_suffix(".lock"))
+        while not stop.is_set():
+            with lock:
+                time.sleep(hold)
+            time.sleep(hold / 10)
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def request(reader, writer, method, path):
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: 0\r\n\r\n".encode())
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line == b"\r\n":
+            break
+        name, _, value = line.decode().partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    body = json.loads(await reader.readexactly(length))
+    return status, body
+
+
+async def client(port, n_books, n_requests, seed, latencies):
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    for _ in range(n_requests):
+        isbn = f"978{rng.randrange(n_books):010d}"
+        roll = rng.random()
+        if roll < 0.7:
+            kind, method, path = "read", "GET", f"/books/{isbn}"
+        elif roll < 0.8:
+            kind, method, path = "search", "GET", f"/books?q=author+{rng.randrange(997)}&limit=10"
+        else:
+            op = rng.choice(["issue", "return"])
+            kind, method, path = "write", "POST", f"/books/{isbn}/{op}"
+        start = time.perf_counter()
+        await request(reader, writer, method, path)
+        latencies[kind].append(time.perf_counter() - start)
+    writer.close()
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+async def wait_for_server(port):
+    for _ in range(400):
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.close()
+            return
+        except OSError:
+            await asyncio.sleep(0.05)
+
+
+async def drive(port, args):
+    await wait_for_server(port)
+    latencies = {"read": [], "search": [], "write": []}
+    start = time.perf_counter()
+    await asyncio.gather(*(client(port, args.books, args.requests, seed, latencies)
+                           for seed in range(args.connections)))
+    return time.perf_counter() - start, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--books", type=int, default=100_000)
+    parser.add_argument("--connections", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=200, help="requests per connection")
+    parser.add_argument("--backend", choices=["json", "sqlite"], default="json")
+    parser.add_argument("--other-desk", type=float, metavar="SECONDS",
+                        help="let another process hold the write lock this long, over and over")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # The SQLite backend imports catalog.json into catalog.db on start.
+        write_catalog(Path(tmp) / "catalog.json", args.books)
+        catalog = Path(tmp) / ("catalog.db" if args.backend == "sqlite" else "catalog.json")
+        port = free_port()
+        server = mp.Process(target=run_server, args=(args.backend, catalog, port), daemon=True)
+        server.start()
+        desk, stop = None, mp.Event()
+        try:
+            if args.other_desk:
+                # Start the other desk once the server has loaded the catalog.
+                asyncio.run(wait_for_server(port))
+                desk = mp.Process(target=other_desk, args=(args.backend, catalog, args.other_desk, stop))
+                desk.start()
+            elapsed, latencies = asyncio.run(drive(port, args))
+        finally:
+            stop.set()
+            if desk is not None:
+                desk.join()
+            server.terminate()
+            server.join()
+
+    total = sum(len(v) for v in latencies.values())
+    print(f"{total} requests over {args.connections} connections in {elapsed:.2f}s "
+          f"-> {total / elapsed:.0f} req/s")
+    print(f"{'kind':<8} {'count':>7} {'p50 (ms)':>9} {'p99 (ms)':>9}")
+    for kind, values in latencies.items():
+        if values:
+            print(f"{kind:<8} {len(values):>7} {percentile(values, 0.5) * 1e3:>9.2f} "
+                  f"{percentile(values, 0.99) * 1e3:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+# benchmarks/bench_isbn_lookup.py
+#
+# Shows that ISBN lookups stay flat as the catalog grows.
+# Run from the project folder:  python -m benchmarks.bench_isbn_lookup
+
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from library_manager.inventory import LibraryInventory
+
+SIZES = [1_000, 10_000, 100_000, 500_000]
+LOOKUPS = 20_000
+
+
+def write_catalog(path, n):
+    books = [
+        {"title": f"Book {i}", "author": f"Author {i % 997}",
+         "isbn": f"978{i:010d}", "status": "available"}
+        for i in range(n)
+    ]
+    with open(path, "w") as f:
+        json.dump(books, f)
+
+
+def main():
+    print(f"{'books':>10} {'load (s)':>10} {'lookup (us)':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in SIZES:
+            path = Path(tmp) / f"catalog_{n}.json"
+            write_catalog(path, n)
+
+            start = time.perf_counter()
+            inventory = LibraryInventory(path)
+            load_time = time.perf_counter() - start
+
+            keys = [f"978{random.randrange(n):010d}" for _ in range(LOOKUPS)]
+            start = time.perf_counter()
+            for isbn in keys:
+                inventory.search_by_isbn(isbn)
+            per_lookup = (time.perf_counter() - start) / LOOKUPS * 1e6
+
+            print(f"{n:>10} {load_time:>10.2f} {per_lookup:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+# benchmarks/bench_journal_writes.py
+#
+# Shows that the cost of one checkout no longer grows with the catalog.
+# Run from the project folder:  python -m benchmarks.bench_journal_writes
+
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from library_manager.inventory import LibraryInventory
+from benchmarks.bench_isbn_lookup import write_catalog
+
+SIZES = [1_000, 10_000, 100_000, 500_000]
+CHECKOUTS = 2_000
+
+
+def main():
+    print(f"{'books':>10} {'issue+return (us)':>18}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in SIZES:
+            path = Path(tmp) / f"catalog_{n}.json"
+            write_catalog(path, n)
+            inventory = LibraryInventory(path)
+
+            keys = random.sample(range(n), min(n, CHECKOUTS))
+            start = time.perf_counter()
+            for i in keys:
+                isbn = f"978{i:010d}"
+                inventory.issue_book(isbn)
+                inventory.return_book(isbn)
+            inventory.close()
+            per_op = (time.perf_counter() - start) / len(keys) * 1e6
+
+            print(f"{n:>10} {per_op:>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# benchmarks/bench_title_search.py
+#
+# Compares the inverted index (search) with the substring scan
+# (search_by_title) on a synthetic catalog.
+# Run from the project folder:  python -m benchmarks.bench_title_search [books]
+
+import itertools
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from library_manager.inventory import LibraryInventory
+
+SYLLABLES = ["ka", "ri", "mo", "ten", "sa", "lor", "vi", "den", "pa", "ul",
+             "gra", "shi", "no", "bel", "tu", "mar", "qi", "zen", "fo", "wyn"]
+
+
+def make_vocabulary(rng, size):
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choices(SYLLABLES, k=rng.randint(2, 4))))
+    return sorted(words)
+
+
+def write_catalog(path, n):
+    """Write n books whose title words follow a Zipf-like distribution."""
+    rng = random.Random(42)
+    words = make_vocabulary(rng, 30_000)
+    rng.shuffle(words)
+    weights = [1 / (rank + 1) for rank in range(len(words))]
+    cum_weights = list(itertools.accumulate(weights))
+    surnames = words[-2_000:]
+
+    with open(path, "w") as f:
+        json.dump([
+            {"title": " ".join(rng.choices(words, cum_weights=cum_weights, k=rng.randint(2, 5))).title(),
+             "author": f"{rng.choice(surnames).title()} {rng.choice(surnames).title()}",
+             "isbn": f"978{i:010d}", "status": "available"}
+            for i in range(n)
+        ], f)
+
+    # A common word, a rarer word, two-word queries, prefixes and an author.
+    return [words[0], words[500], f"{words[3]} {words[40]}", words[20][:3],
+            f"{words[1][:4]} {words[900][:4]}", surnames[7]]
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "catalog.json"
+        queries = write_catalog(path, n)
+        inventory = LibraryInventory(path)
+
+        build, _ = timed(inventory.search, "warmup")
+        print(f"{n} books, index built in {build:.2f}s")
+        print(f"{'query':<22} {'scan (ms)':>10} {'index (ms)':>11} {'hits':>8}")
+        for query in queries:
+            scan, _ = timed(inventory.search_by_title, query)
+            index, hits = timed(inventory.search, query, 20)
+            print(f"{query:<22} {scan * 1e3:>10.1f} {index * 1e3:>11.1f} {len(hits):>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# benchmarks/stress_concurrent_desks.py
+#
+# Several processes issue and return books in the same catalog at once.
+# Fails if a copy is ever issued to two desks, or if the catalog on disk
+# disagrees with what the desks did.
+# Run from the project folder:
+#   python -m benchmarks.stress_concurrent_desks [--workers 8] [--backend json]
+
+import argparse
+import multiprocessing as mp
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from library_manager.book import Book
+from library_manager.inventory import LibraryInventory
+from library_manager.sqlite_inventory import SqliteInventory
+
+
+def open_catalog(backend, catalog, compact_threshold):
+    if backend == "sqlite":
+        return SqliteInventory(catalog)
+    return LibraryInventory(catalog, compact_threshold=compact_threshold)
+
+
+def desk(desk_id, backend, catalog, n_books, ops, holders, holders_lock,
+         double_issues, compact_threshold):
+    rng = random.Random(desk_id)
+    inventory = open_catalog(backend, catalog, compact_threshold)
+    mine = []
+
+    for _ in range(ops):
+        if mine and rng.random() < 0.5:
+            i = mine.pop(rng.randrange(len(mine)))
+            # Give the copy up before returning it, so the next desk to
+            # issue it never sees a stale holder.
+            with holders_lock:
+                holders[i] = 0
+            if not inventory.return_book(f"isbn-{i}"):
+                raise AssertionError(f"desk {desk_id} could not return isbn-{i}")
+        else:
+            i = rng.randrange(n_books)
+            if inventory.issue_book(f"isbn-{i}"):
+                with holders_lock:
+                    if holders[i]:
+                        double_issues.value += 1
+                    holders[i] = desk_id
+                mine.append(i)
+
+    inventory.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--ops", type=int, default=2000, help="operations per worker")
+    parser.add_argument("--books", type=int, default=50)
+    parser.add_argument("--backend", choices=["json", "sqlite"], default="json")
+    parser.add_argument("--compact-threshold", type=int, default=64 * 1024,
+                        help="small, so compactions happen during the run")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        catalog = Path(tmp) / ("catalog.json" if args.backend == "json" else "catalog.db")
+        inventory = open_catalog(args.backend, catalog, args.compact_threshold)
+        for i in range(args.books):
+            inventory.add_book(Book(f"Title {i}", "Author", f"isbn-{i}"))
+        inventory.close()
+
+        holders = mp.Array("i", args.books, lock=False)
+        holders_lock = mp.Lock()
+        double_issues = mp.Value("i", 0, lock=False)
+        workers = [
+            mp.Process(target=desk, args=(
+                desk_id, args.backend, catalog, args.books, args.ops,
+                holders, holders_lock, double_issues, args.compact_threshold))
+            for desk_id in range(1, args.workers + 1)
+        ]
+        start = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - start
+        if any(worker.exitcode for worker in workers):
+            print("FAILED: a desk crashed")
+            sys.exit(1)
+
+        inventory = open_catalog(args.backend, catalog, args.compact_threshold)
+        on_disk = {b.isbn for b in inventory.display_all() if not b.is_available()}
+        expected = {f"isbn-{i}" for i, holder in enumerate(holders) if holder}
+        inventory.close()
+
+    total_ops = args.workers * args.ops
+    print(f"{args.workers} desks, {total_ops} operations in {elapsed:.2f}s "
+          f"({total_ops / elapsed:.0f} ops/s)")
+    print(f"double issues: {double_issues.value}")
+    print(f"issued on disk: {len(on_disk)}, held by desks: {len(expected)}")
+    if double_issues.value or on_disk != expected:
+        print("FAILED")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,11 @@
+import argparse
+import asyncio
+import itertools
+
+from library_manager.backends import DEFAULT_FILES, open_inventory
 from library_manager.book import Book
-from library_manager.inventory import LibraryInventory
+from library_manager.catalog_io import book_from_record, iter_records, write_records
+from library_manager.service import serve
 
 def show_menu():
     print("\n===== Library Inventory Manager =====")
@@ -10,20 +16,86 @@ def show_menu():
     print("5. Search Book")
     print("6. Exit")
 
-def main():
-    inventory = LibraryInventory()
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Library Inventory Manager")
+    parser.add_argument("--backend", choices=sorted(DEFAULT_FILES), default="json",
+                        help="where the catalog is stored (default: json)")
+    parser.add_argument("--catalog", help="catalog file (default: data/catalog.json or data/catalog.db)")
+
+    commands = parser.add_subparsers(dest="command", metavar="command",
+                                     help="run once and exit instead of showing the menu")
+    import_cmd = commands.add_parser("import", help="add books from a .csv or .jsonl file")
+    import_cmd.add_argument("file")
+    import_cmd.add_argument("--chunk-size", type=int, default=10_000,
+                            help="books read and saved per batch (default: 10000)")
+    export_cmd = commands.add_parser("export", help="write the catalog to a .csv or .jsonl file")
+    export_cmd.add_argument("file")
+    serve_cmd = commands.add_parser("serve", help="serve the catalog over HTTP/JSON")
+    serve_cmd.add_argument("--host", default="127.0.0.1")
+    serve_cmd.add_argument("--port", type=int, default=8080)
+    return parser.parse_args(argv)
+
+def import_books(inventory, path, chunk_size):
+    """Stream books from a file into the catalog, one chunk at a time.
+
+    Only one chunk is held in memory, and each chunk is saved once.
+    """
+    added = duplicates = invalid = 0
+    records = iter_records(path)
+    while True:
+        chunk = list(itertools.islice(records, chunk_size))
+        if not chunk:
+            break
+        books = [book_from_record(r) for r in chunk]
+        valid = [b for b in books if b is not None]
+        invalid += len(books) - len(valid)
+        count = len(inventory.add_books(valid))
+        added += count
+        duplicates += len(valid) - count
+        print(f"  {added} added so far...")
+    print(f"Imported {added} books from {path} "
+          f"({duplicates} duplicate ISBNs skipped, {invalid} invalid rows skipped).")
+
+def export_books(inventory, path):
+    count = write_records(path, inventory.display_all())
+    print(f"Exported {count} books to {path}.")
+
+def main(argv=None):
+    args = parse_args(argv)
+    inventory = open_inventory(args.backend, args.catalog)
+
+    if args.command == "import":
+        import_books(inventory, args.file, args.chunk_size)
+        inventory.close()
+        return
+    if args.command == "export":
+        export_books(inventory, args.file)
+        inventory.close()
+        return
+    if args.command == "serve":
+        try:
+            asyncio.run(serve(inventory, args.host, args.port))
+        except KeyboardInterrupt:
+            print("\nServer stopped.")
+        finally:
+            inventory.close()
+        return
 
     while True:
         show_menu()
         choice = input("Enter choice: ")
+        # Pick up changes made by other desks sharing the catalog.
+        inventory.refresh()
 
         if choice == "1":
             title = input("Title: ")
             author = input("Author: ")
             isbn = input("ISBN: ")
             book = Book(title, author, isbn)
-            inventory.add_book(book)
-            print("Book added successfully!")
+            if inventory.add_book(book):
+                print("Book added successfully!")
+            else:
+                print("A book with this ISBN already exists.")
 
         elif choice == "2":
             isbn = input("Enter ISBN to issue: ")
@@ -40,16 +112,16 @@ def main():
                 print("Book not found or already available.")
 
         elif choice == "4":
-            books = inventory.display_all()
-            if not books:
+            count = 0
+            for b in inventory.display_all():
+                print(b)
+                count += 1
+            if not count:
                 print("Catalog is empty.")
-            else:
-                for b in books:
-                    print(b)
 
         elif choice == "5":
-            title = input("Enter title keyword: ")
-            results = inventory.search_by_title(title)
+            query = input("Enter title or author keywords: ")
+            results = inventory.search(query)
             if results:
                 for b in results:
                     print(b)
@@ -57,6 +129,7 @@ def main():
                 print("No books found.")
 
         elif choice == "6":
+            inventory.close()
             print("Exiting program.")
             break
 
@@ -0,0 +1,19 @@
+# library_manager/backends.py
+
+from .inventory import LibraryInventory
+from .sqlite_inventory import SqliteInventory
+
+DEFAULT_FILES = {
+    "json": "data/catalog.json",
+    "sqlite": "data/catalog.db",
+}
+
+
+def open_inventory(backend="json", catalog_file=None):
+    """Open the inventory stored by the named backend ("json" or "sqlite")."""
+    if backend not in DEFAULT_FILES:
+        raise ValueError(f"Unknown backend {backend!r}; choose from {', '.join(DEFAULT_FILES)}")
+    catalog_file = catalog_file or DEFAULT_FILES[backend]
+    if backend == "sqlite":
+        return SqliteInventory(catalog_file)
+    return LibraryInventory(catalog_file)
@@ -1,9 +1,24 @@
+import sys
+
+
 class Book:
+    # No per-instance __dict__: a large catalog holds one of these per title.
+    __slots__ = ("title", "author", "isbn", "_status")
+
     def __init__(self, title, author, isbn, status="available"):
         self.title = title
         self.author = author
         self.isbn = isbn
-        self.status = status.lower()
+        self.status = status
+
+    @property
+    def status(self):
+        return self._status
+
+    @status.setter
+    def status(self, value):
+        # Interned, so every book shares one string per status.
+        self._status = sys.intern(value.lower())
 
     def __str__(self):
         return f"{self.title} by {self.author} | ISBN: {self.isbn} | Status: {self.status}"
@@ -0,0 +1,119 @@
+# library_manager/catalog_io.py
+
+import csv
+import json
+import re
+from pathlib import Path
+from .book import Book
+
+# Whitespace and the commas between array items.
+_SEPARATORS = re.compile(r"[\s,]*")
+
+
+def iter_json_array(path, chunk_size=1 << 16):
+    """Yield the objects of a JSON array file one at a time.
+
+    Only a chunk of text and the current object are held in memory, so a
+    large catalog can be loaded without parsing the whole document first.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as f:
+        buf = f.read(chunk_size)
+        pos = _SEPARATORS.match(buf).end()
+        if buf[pos:pos + 1] != "[":
+            raise ValueError(f"{path}: expected a JSON array")
+        pos += 1
+
+        while True:
+            pos = _SEPARATORS.match(buf, pos).end()
+            if pos == len(buf):
+                buf, pos = f.read(chunk_size), 0
+                if not buf:
+                    raise ValueError(f"{path}: unexpected end of file")
+                continue
+            if buf[pos] == "]":
+                return
+            try:
+                item, pos = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                # Usually the object runs past the end of the buffer.
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    raise
+                buf, pos = buf[pos:] + chunk, 0
+                continue
+            yield item
+
+
+def write_json_array(f, items):
+    """Write items to f as a JSON array, one object at a time."""
+    f.write("[")
+    for i, item in enumerate(items):
+        if i:
+            f.write(",\n")
+        f.write(json.dumps(item, separators=(",", ":")))
+    f.write("]\n")
+
+
+FIELDS = ["title", "author", "isbn", "status"]
+STATUSES = ("available", "issued")
+FORMATS = (".csv", ".jsonl")
+
+
+def _format(path):
+    suffix = Path(path).suffix.lower()
+    if suffix not in FORMATS:
+        raise ValueError(f"{path}: expected a .csv or .jsonl file")
+    return suffix
+
+
+def book_from_record(record):
+    """Build a Book from an imported record, or None if the record is invalid."""
+    try:
+        title, author, isbn = record["title"], record["author"], record["isbn"]
+        status = (record.get("status") or "available").lower()
+    except (KeyError, TypeError, AttributeError):
+        return None
+    author = author or ""
+    if not all(isinstance(v, str) for v in (title, author, isbn)):
+        return None
+    if not title or not isbn or status not in STATUSES:
+        return None
+    return Book(title, author, isbn, status)
+
+
+def iter_records(path):
+    """Yield book records (dicts) from a CSV or JSON Lines file, one at a time.
+
+    A JSON Lines line that doesn't parse is yielded as None, which
+    book_from_record rejects like any other invalid record.
+    """
+    if _format(path) == ".csv":
+        with open(path, "r", newline="", encoding="utf-8") as f:
+            yield from csv.DictReader(f)
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        yield None
+
+
+def write_records(path, books):
+    """Write books to a CSV or JSON Lines file as they are produced. Returns the count."""
+    count = 0
+    if _format(path) == ".csv":
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(FIELDS)
+            for book in books:
+                writer.writerow([book.title, book.author, book.isbn, book.status])
+                count += 1
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            for book in books:
+                f.write(json.dumps(book.to_dict()) + "\n")
+                count += 1
+    return count
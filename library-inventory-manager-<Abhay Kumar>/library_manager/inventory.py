@@ -1,63 +1,279 @@
 # library_manager/inventory.py
 
-import json
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 from .book import Book
+from .catalog_io import iter_json_array, write_json_array
+from .journal import CatalogJournal, StaleJournalError
+from .locking import FileLock
+from .search import TitleIndex
 
 
 class LibraryInventory:
-    def __init__(self, catalog_file="data/catalog.json"):
+    """Catalog kept in memory and persisted as a JSON snapshot plus a journal.
+
+    Safe to share between threads, and between processes using the same
+    catalog file: changes are made under a lock file, after catching up
+    with whatever other processes have journaled.
+    """
+
+    # search() and search_by_isbn() only touch memory and never wait for
+    # writers, so the HTTP service calls them on its event loop.
+    reads_in_memory = True
+
+    def __init__(self, catalog_file="data/catalog.json", compact_threshold=4 * 1024 * 1024):
         self.catalog_file = Path(catalog_file)
+        self.journal = CatalogJournal(self.catalog_file.with_suffix(".journal"))
+        # Journal size in bytes at which it is folded into a new snapshot.
+        self.compact_threshold = compact_threshold
         self.books = []
+        self._isbn_index = {}
+        # Built on the first search() call, then kept up to date.
+        self._title_index = None
+        self._compactor = None
+        self._lock = threading.RLock()
+        # Guards only _title_index. It is never held across I/O or the
+        # file lock, so search() doesn't wait for a writer that is
+        # catching up with the journal or waiting for another desk.
+        self._index_lock = threading.Lock()
+        self._file_lock = FileLock(self.catalog_file.with_suffix(".lock"))
         self.load_catalog()
 
+    @contextmanager
+    def _locked(self):
+        """Hold both the in-process and the cross-process lock."""
+        with self._lock, self._file_lock:
+            yield
+
     def load_catalog(self):
-        """Load books from JSON. If file missing or corrupted, create a new one."""
-        try:
-            if self.catalog_file.exists():
-                with open(self.catalog_file, "r") as f:
-                    data = json.load(f)
-                    self.books = [Book(**b) for b in data]
-            else:
+        """Load the JSON snapshot, then replay the journal on top of it.
+
+        If the snapshot is missing or corrupted, start from an empty one.
+        """
+        with self._locked():
+            try:
+                if self.catalog_file.exists():
+                    self.books = [Book(**b) for b in iter_json_array(self.catalog_file)]
+                    self._rebuild_index()
+                else:
+                    self.save_catalog()
+            except Exception:
+                # If any error happens, reset to empty list
+                self.books = []
+                self._isbn_index = {}
+                self.save_catalog()
+
+            for record in self.journal.replay():
+                self._apply(record)
+
+            if self.journal.rotated_file.exists() and not self._compacting():
+                # A compaction was interrupted (or is running in another
+                # process); either way a fresh snapshot makes it redundant.
                 self.save_catalog()
-        except Exception:
-            # If any error happens, reset to empty list
-            self.books = []
-            self.save_catalog()
+                self.journal.discard_rotated()
+            self._maybe_compact()
+            # Searches keep using the old index during the reload; the
+            # new one is built outside the index lock and swapped in.
+            if self._title_index is not None:
+                index = TitleIndex(self.books)
+                with self._index_lock:
+                    self._title_index = index
+
+    def refresh(self):
+        """Catch up with changes other processes have made to the catalog.
+
+        Only the journal records written since the last refresh are read.
+        The whole catalog is reloaded only if those records were already
+        compacted away.
+        """
+        with self._locked():
+            try:
+                for record in self.journal.read_new():
+                    self._apply(record)
+            except StaleJournalError:
+                self.load_catalog()
+
+    def _rebuild_index(self):
+        """Map every ISBN to its Book so lookups don't scan the list."""
+        self._isbn_index = {}
+        for b in self.books:
+            # Older catalogs may hold duplicates; keep the first, as the scan did.
+            self._isbn_index.setdefault(b.isbn, b)
+
+    def _apply(self, record):
+        """Apply one journal record. Replaying a record twice is harmless."""
+        if record["op"] == "add":
+            book = Book(**record["book"])
+            if book.isbn not in self._isbn_index:
+                self._insert(book)
+        elif record["op"] == "status":
+            book = self._isbn_index.get(record["isbn"])
+            if book:
+                book.status = record["status"]
+
+    def _insert(self, book):
+        # Appended before indexing, so an index built meanwhile by
+        # search() already has the book (adding it twice is harmless).
+        self.books.append(book)
+        self._isbn_index[book.isbn] = book
+        with self._index_lock:
+            if self._title_index is not None:
+                self._title_index.add(book)
 
     def save_catalog(self):
-        """Save current list of books to JSON."""
-        with open(self.catalog_file, "w") as f:
-            json.dump([b.to_dict() for b in self.books], f, indent=4)
+        """Save current list of books to JSON as a full snapshot."""
+        with self._locked():
+            tmp_file = self._write_temp_snapshot(b.to_dict() for b in self.books)
+            os.replace(tmp_file, self.catalog_file)
+
+    def _write_temp_snapshot(self, data):
+        # Snapshots are written to a temp file and renamed over the
+        # catalog, so a crash never leaves a half-written catalog behind.
+        self.catalog_file.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_file = tempfile.mkstemp(
+            dir=self.catalog_file.parent, prefix=self.catalog_file.name + ".", suffix=".tmp")
+        try:
+            with open(fd, "w") as f:
+                write_json_array(f, data)
+                f.flush()
+                os.fsync(f.fileno())
+        except BaseException:
+            os.unlink(tmp_file)
+            raise
+        return tmp_file
+
+    def _compacting(self):
+        return self._compactor is not None and self._compactor.is_alive()
+
+    def _maybe_compact(self):
+        """Fold the journal into a new snapshot in the background once it is large."""
+        if self.journal.size() < self.compact_threshold or self._compacting():
+            return
+        data = [b.to_dict() for b in self.books]
+        if not self.journal.rotate():
+            return
+        rotated_id = self.journal.rotated_id()
+        self._compactor = threading.Thread(target=self._compact, args=(data, rotated_id))
+        self._compactor.start()
+
+    def _compact(self, data, rotated_id):
+        tmp_file = self._write_temp_snapshot(data)
+        with self._locked():
+            # Another process may have finished this compaction while we
+            # were writing (see load_catalog), and even rotated again since.
+            # Our snapshot would then be older than the journals it replaces.
+            if self.journal.rotated_id() == rotated_id:
+                os.replace(tmp_file, self.catalog_file)
+                self.journal.discard_rotated()
+            else:
+                os.unlink(tmp_file)
+
+    def close(self):
+        """Flush the journal and wait for any running compaction."""
+        with self._lock:
+            self.journal.close()
+        if self._compactor is not None:
+            self._compactor.join()
+        with self._lock:
+            self._file_lock.close()
+
+    def _log(self, record):
+        self.journal.append(record)
+        self._maybe_compact()
+
+    def _log_batch(self, records):
+        # One write for the whole batch; callers fsync once the locks are
+        # released, so readers and other desks don't wait on the disk.
+        self.journal.append_many(records)
+        self._maybe_compact()
 
     def add_book(self, book):
-        self.books.append(book)
-        self.save_catalog()
+        """Add a book. Returns False if its ISBN is already in the catalog."""
+        with self._locked():
+            self.refresh()
+            if book.isbn in self._isbn_index:
+                return False
+            self._insert(book)
+            self._log({"op": "add", "book": book.to_dict()})
+            return True
+
+    def add_books(self, books):
+        """Add many books, persisting them once. Returns the books added.
+
+        Books whose ISBN is already in the catalog, or earlier in the
+        batch, are skipped.
+        """
+        with self._locked():
+            self.refresh()
+            added = []
+            for book in books:
+                if book.isbn not in self._isbn_index:
+                    self._insert(book)
+                    added.append(book)
+            self._log_batch([{"op": "add", "book": b.to_dict()} for b in added])
+        self.journal.sync()
+        return added
 
     def search_by_title(self, title):
         return [b for b in self.books if title.lower() in b.title.lower()]
 
+    def search(self, query, limit=None):
+        """Find books by words from the title or author, best match first.
+
+        Each word matches as a prefix, and every word must match.
+        Served from memory without waiting for writers.
+        """
+        with self._index_lock:
+            if self._title_index is None:
+                self._title_index = TitleIndex(self.books)
+            return self._title_index.search(query, limit)
+
     def search_by_isbn(self, isbn):
-        for book in self.books:
-            if book.isbn == isbn:
-                return book
-        return None
+        return self._isbn_index.get(isbn)
 
     def display_all(self):
         return self.books
 
     def issue_book(self, isbn):
-        book = self.search_by_isbn(isbn)
-        if book and book.is_available():
-            book.issue()
-            self.save_catalog()
-            return True
-        return False
+        with self._locked():
+            self.refresh()
+            book = self.search_by_isbn(isbn)
+            if book and book.is_available():
+                book.issue()
+                self._log({"op": "status", "isbn": isbn, "status": book.status})
+                return True
+            return False
 
     def return_book(self, isbn):
-        book = self.search_by_isbn(isbn)
-        if book and not book.is_available():
-            book.return_book()
-            self.save_catalog()
-            return True
-        return False
+        with self._locked():
+            self.refresh()
+            book = self.search_by_isbn(isbn)
+            if book and not book.is_available():
+                book.return_book()
+                self._log({"op": "status", "isbn": isbn, "status": book.status})
+                return True
+            return False
+
+    def _set_status_many(self, isbns, available, change):
+        with self._locked():
+            self.refresh()
+            changed = []
+            for isbn in isbns:
+                book = self.search_by_isbn(isbn)
+                if book and book.is_available() == available:
+                    change(book)
+                    changed.append(book)
+            self._log_batch([{"op": "status", "isbn": b.isbn, "status": b.status} for b in changed])
+        self.journal.sync()
+        return [b.isbn for b in changed]
+
+    def issue_many(self, isbns):
+        """Issue every available book in isbns, persisting once. Returns the ISBNs issued."""
+        return self._set_status_many(isbns, True, Book.issue)
+
+    def return_many(self, isbns):
+        """Return every issued book in isbns, persisting once. Returns the ISBNs returned."""
+        return self._set_status_many(isbns, False, Book.return_book)
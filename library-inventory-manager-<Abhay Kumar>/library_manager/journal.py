@@ -0,0 +1,202 @@
+# library_manager/journal.py
+
+import json
+import os
+import time
+import uuid
+from pathlib import Path
+
+
+class StaleJournalError(Exception):
+    """Records were folded into a snapshot before this process read them."""
+
+
+class CatalogJournal:
+    """Append-only log of catalog changes, one JSON record per line.
+
+    Records are handed to the OS on every append, so they survive a crash
+    of the program. They are fsynced to disk in batches: after
+    ``sync_every`` records, after ``sync_interval`` seconds, or on sync().
+
+    Each journal file starts with a header naming it and the journal it
+    replaced, so a process sharing the file can tell how far behind it is.
+    Callers must hold the catalog's file lock around every method here.
+    """
+
+    def __init__(self, journal_file, sync_every=64, sync_interval=1.0):
+        self.journal_file = Path(journal_file)
+        self.rotated_file = self.journal_file.with_name(self.journal_file.name + ".old")
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self._file = None
+        self._pending = 0
+        self._last_sync = time.monotonic()
+        # How far this process has read: journal id and byte offset.
+        self._id = None
+        self._offset = 0
+        self._seen = None
+
+    def append(self, record):
+        self.append_many([record])
+
+    def append_many(self, records):
+        """Append several records with a single write."""
+        if not records:
+            return
+        if self._file is None:
+            self.journal_file.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.journal_file, "ab")
+            if self._file.tell() == 0:
+                self._start(prev=None, prev_size=0)
+        self._write(records)
+        self._pending += len(records)
+        if (self._pending >= self.sync_every
+                or time.monotonic() - self._last_sync >= self.sync_interval):
+            self.sync()
+
+    def _start(self, prev, prev_size):
+        self._id = uuid.uuid4().hex
+        self._write([{"op": "journal", "id": self._id, "prev": prev, "prev_size": prev_size}])
+
+    def _write(self, records):
+        self._file.write(b"".join(
+            json.dumps(record, separators=(",", ":")).encode() + b"\n" for record in records))
+        self._file.flush()
+        self._offset = self._file.tell()
+        self._seen = self._stat_key(self.journal_file)
+
+    def sync(self):
+        """Force pending records to disk.
+
+        Safe to call without the file lock; if another thread closed the
+        file meanwhile, close() has already synced it.
+        """
+        f = self._file
+        if f is not None and self._pending:
+            try:
+                os.fsync(f.fileno())
+            except ValueError:
+                pass
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+
+    def size(self):
+        try:
+            return self.journal_file.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    @staticmethod
+    def _stat_key(path):
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return None
+        return st.st_ino, st.st_size, st.st_mtime_ns
+
+    @staticmethod
+    def _header(path):
+        """The header record of a journal, {} for an old headerless one, None if missing."""
+        try:
+            with open(path, "rb") as f:
+                line = f.readline()
+        except FileNotFoundError:
+            return None
+        try:
+            record = json.loads(line)
+        except ValueError:
+            return {}
+        return record if record.get("op") == "journal" else {}
+
+    def replay(self):
+        """Yield every record, oldest first, from the rotated and current journals."""
+        # The append handle may point at a file that has since been rotated.
+        self.close()
+        yield from self._read(self.rotated_file)
+        header = self._header(self.journal_file)
+        self._id = header.get("id") if header else None
+        self._offset = 0
+        yield from self._read(self.journal_file)
+        self._seen = self._stat_key(self.journal_file)
+
+    def read_new(self):
+        """Yield records other processes appended since this one last read or wrote.
+
+        Raises StaleJournalError if some of them were already compacted away.
+        """
+        seen = self._stat_key(self.journal_file)
+        if seen == self._seen:
+            return
+        header = self._header(self.journal_file)
+        if header is None:
+            header = {}
+        if header.get("id") != self._id:
+            # Our journal was rotated out for compaction. Finish reading it
+            # if it is still there, then check the new one follows on.
+            self.close()
+            rotated = self._header(self.rotated_file)
+            if rotated is not None and rotated.get("id") == self._id:
+                yield from self._read(self.rotated_file, self._offset)
+            if header.get("prev") != self._id or header.get("prev_size", 0) != self._offset:
+                raise StaleJournalError(self.journal_file)
+            self._id = header.get("id")
+            self._offset = 0
+        yield from self._read(self.journal_file, self._offset)
+        self._seen = self._stat_key(self.journal_file)
+
+    def _read(self, path, start=0):
+        try:
+            f = open(path, "rb")
+        except FileNotFoundError:
+            return
+        with f:
+            f.seek(start)
+            good_end = start
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                good_end += len(line)
+                self._offset = good_end
+                yield record
+        # A crash can leave half a record at the end; cut it off so that
+        # new appends don't land behind it.
+        if good_end < path.stat().st_size:
+            self.close()
+            os.truncate(path, good_end)
+
+    def rotate(self):
+        """Move the current journal aside so a snapshot can absorb it.
+
+        Returns False if an earlier rotation has not been discarded yet.
+        """
+        if self.rotated_file.exists():
+            return False
+        self.close()
+        prev, prev_size = self._id, self._offset
+        if self.journal_file.exists():
+            os.replace(self.journal_file, self.rotated_file)
+        self._file = open(self.journal_file, "ab")
+        self._start(prev, prev_size)
+        return True
+
+    def rotated_id(self):
+        """Id of the journal waiting to be compacted, or None if there is none."""
+        header = self._header(self.rotated_file)
+        return None if header is None else header.get("id", "")
+
+    def discard_rotated(self):
+        """Drop the rotated journal once a snapshot containing it is on disk."""
+        try:
+            self.rotated_file.unlink()
+        except FileNotFoundError:
+            pass
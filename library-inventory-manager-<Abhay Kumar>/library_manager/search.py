@@ -0,0 +1,132 @@
+# library_manager/search.py
+
+import heapq
+import re
+from bisect import bisect_left
+
+_WORD = re.compile(r"\w+")
+
+# How much a matching word counts towards a book's score.
+TITLE_WEIGHT = 2
+AUTHOR_WEIGHT = 1
+
+
+def tokenize(text):
+    return _WORD.findall(text.lower())
+
+
+def word_weights(book):
+    """Map each word of the book's title and author to its weight."""
+    weights = {}
+    for word in tokenize(book.title):
+        weights[word] = TITLE_WEIGHT
+    for word in tokenize(book.author):
+        weights[word] = weights.get(word, 0) + AUTHOR_WEIGHT
+    return weights
+
+
+class TitleIndex:
+    """Inverted index from title and author words to books.
+
+    Every query word matches as a prefix ("pot" finds "Potter"). A book
+    must match all query words; whole-word and title matches rank higher.
+    """
+
+    def __init__(self, books=()):
+        self._postings = {}      # word -> {book: weight}
+        self._words = []         # sorted vocabulary, for prefix lookups
+        self._new_words = []     # added since the vocabulary was last sorted
+        for book in books:
+            self.add(book)
+
+    def __len__(self):
+        return len(self._postings)
+
+    def add(self, book):
+        for word, weight in word_weights(book).items():
+            posting = self._postings.get(word)
+            if posting is None:
+                posting = self._postings[word] = {}
+                self._new_words.append(word)
+            posting[book] = weight
+
+    def _vocabulary(self):
+        if self._new_words:
+            # The list is sorted apart from the new tail, which timsort
+            # merges in close to linear time.
+            self._words.extend(self._new_words)
+            self._words.sort()
+            self._new_words = []
+        return self._words
+
+    def _expand(self, term):
+        """List (word, boost) for every word starting with term.
+
+        Whole-word matches get double the boost of prefix matches.
+        """
+        words = self._vocabulary()
+        matches = []
+        i = bisect_left(words, term)
+        while i < len(words) and words[i].startswith(term):
+            matches.append((words[i], 2 if words[i] == term else 1))
+            i += 1
+        return matches
+
+    def _postings_size(self, matches):
+        return sum(len(self._postings[word]) for word, _ in matches)
+
+    def _score(self, matches):
+        """Score every book containing one of the matched words."""
+        scores = {}
+        for word, boost in matches:
+            posting = self._postings[word]
+            if not scores:
+                scores = {book: weight * boost for book, weight in posting.items()}
+                continue
+            for book, weight in posting.items():
+                score = weight * boost
+                if score > scores.get(book, 0):
+                    scores[book] = score
+        return scores
+
+    def _narrow(self, candidates, matches):
+        """Keep only candidates that contain one of the matched words."""
+        narrowed = {}
+        postings = [(self._postings[word], boost) for word, boost in matches]
+        for book, score in candidates.items():
+            best = 0
+            for posting, boost in postings:
+                weight = posting.get(book, 0) * boost
+                if weight > best:
+                    best = weight
+            if best:
+                narrowed[book] = score + best
+        return narrowed
+
+    def search(self, query, limit=None):
+        """Return books matching every word of query, best match first."""
+        terms = [self._expand(term) for term in set(tokenize(query))]
+        if not terms:
+            return []
+
+        # Start from the rarest term so the candidate set is small early.
+        terms.sort(key=self._postings_size)
+        candidates = self._score(terms[0])
+        for matches in terms[1:]:
+            if not candidates:
+                return []
+            if len(candidates) * len(matches) < self._postings_size(matches):
+                candidates = self._narrow(candidates, matches)
+            else:
+                scores = self._score(matches)
+                candidates = {book: score + scores[book]
+                              for book, score in candidates.items() if book in scores}
+
+        def rank(item):
+            return -item[1], item[0].title
+
+        if limit is None:
+            ranked = sorted(candidates.items(), key=rank)
+        else:
+            ranked = heapq.nsmallest(limit, candidates.items(), key=rank)
+        return [book for book, _ in ranked]
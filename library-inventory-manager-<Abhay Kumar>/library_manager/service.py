@@ -0,0 +1,211 @@
+# library_manager/service.py
+
+import asyncio
+import json
+from http import HTTPStatus
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from .catalog_io import book_from_record
+
+MAX_BODY = 64 * 1024
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _content_length(headers):
+    """The request's body length, or None if the header isn't a plain number."""
+    value = headers.get("content-length", "0")
+    return int(value) if value.isascii() and value.isdigit() else None
+
+
+class LibraryService:
+    """HTTP/JSON front end for an inventory, built on asyncio streams.
+
+    Routes:
+        GET  /books/<isbn>            one book
+        GET  /books?q=words&limit=N   word search over titles and authors
+        POST /books                   add a book (JSON body: title, author, isbn)
+        POST /books/<isbn>/issue      issue a book
+        POST /books/<isbn>/return     return a book
+
+    Reads of an in-memory inventory are answered on the event loop; they
+    never wait for writers. Backends whose reads do I/O (SQLite) are
+    read from worker threads, so a slow query can't stall the loop.
+    Writes are queued. A single writer task takes everything that has
+    queued up and applies it with the bulk methods in a worker thread, so
+    concurrent writes share one persistence call.
+    """
+
+    def __init__(self, inventory, max_batch=1024):
+        self.inventory = inventory
+        self.max_batch = max_batch
+        self._writes = None
+        self._writer = None
+        self._server = None
+
+    async def start(self, host="127.0.0.1", port=8080):
+        self._writes = asyncio.Queue()
+        self._writer = asyncio.create_task(self._write_loop())
+        # Build the search index now rather than on the first request.
+        await asyncio.to_thread(self.inventory.search, "")
+        self._server = await asyncio.start_server(self._handle_client, host, port)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def serve_forever(self):
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def stop(self):
+        self._server.close()
+        await self._server.wait_closed()
+        self._writer.cancel()
+
+    async def _read(self, method, *args):
+        if getattr(self.inventory, "reads_in_memory", False):
+            return method(*args)
+        return await asyncio.to_thread(method, *args)
+
+    # ----- writes ------------------------------------------------------
+
+    async def _submit(self, op, arg):
+        future = asyncio.get_running_loop().create_future()
+        await self._writes.put((op, arg, future))
+        return await future
+
+    async def _write_loop(self):
+        while True:
+            batch = [await self._writes.get()]
+            while len(batch) < self.max_batch and not self._writes.empty():
+                batch.append(self._writes.get_nowait())
+            try:
+                results = await asyncio.to_thread(self._apply_batch, batch)
+            except Exception as exc:
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+            for (_, _, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+    def _apply_batch(self, batch):
+        """Apply queued writes in order, one bulk call per run of the same kind."""
+        results = []
+        start = 0
+        while start < len(batch):
+            op = batch[start][0]
+            end = start
+            while end < len(batch) and batch[end][0] == op:
+                end += 1
+            args = [arg for _, arg, _ in batch[start:end]]
+
+            if op == "add":
+                added = {id(book) for book in self.inventory.add_books(args)}
+                results += [id(book) in added for book in args]
+            else:
+                bulk = self.inventory.issue_many if op == "issue" else self.inventory.return_many
+                changed = set(bulk(args))
+                for isbn in args:
+                    # Two requests for the same copy: only the first wins.
+                    results.append(isbn in changed)
+                    changed.discard(isbn)
+            start = end
+        return results
+
+    # ----- HTTP --------------------------------------------------------
+
+    async def _handle_client(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                length = _content_length(headers)
+                if length is None:
+                    status, payload = HTTPStatus.BAD_REQUEST, {"error": "invalid Content-Length"}
+                    keep_alive = False
+                elif length > MAX_BODY:
+                    status, payload = HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": "body too large"}
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    try:
+                        method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                        status, payload = await self._route(method, target, body)
+                    except HttpError as exc:
+                        status, payload = exc.status, {"error": str(exc)}
+                    except ValueError:
+                        status, payload = HTTPStatus.BAD_REQUEST, {"error": "malformed request"}
+                    except Exception as exc:
+                        status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(exc)}
+                    keep_alive = headers.get("connection", "").lower() != "close"
+
+                data = json.dumps(payload).encode()
+                writer.write(
+                    f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode()
+                    + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _route(self, method, target, body):
+        url = urlsplit(target)
+        parts = [unquote(p) for p in url.path.strip("/").split("/")]
+        if not parts or parts[0] != "books":
+            raise HttpError(HTTPStatus.NOT_FOUND, "no such route")
+
+        if method == "GET" and len(parts) == 1:
+            query = parse_qs(url.query)
+            words = query.get("q", [""])[0]
+            limit = int(query.get("limit", ["20"])[0])
+            books = await self._read(self.inventory.search, words, limit)
+            return HTTPStatus.OK, [b.to_dict() for b in books]
+
+        if method == "GET" and len(parts) == 2:
+            book = await self._read(self.inventory.search_by_isbn, parts[1])
+            if book is None:
+                raise HttpError(HTTPStatus.NOT_FOUND, "book not found")
+            return HTTPStatus.OK, book.to_dict()
+
+        if method == "POST" and len(parts) == 1:
+            book = book_from_record(json.loads(body or b"null"))
+            if book is None:
+                raise HttpError(HTTPStatus.BAD_REQUEST, "title, author and isbn are required")
+            if not await self._submit("add", book):
+                raise HttpError(HTTPStatus.CONFLICT, "a book with this ISBN already exists")
+            return HTTPStatus.CREATED, book.to_dict()
+
+        if method == "POST" and len(parts) == 3 and parts[2] in ("issue", "return"):
+            isbn, op = parts[1], parts[2]
+            if not await self._submit(op, isbn):
+                message = "not available" if op == "issue" else "not issued"
+                raise HttpError(HTTPStatus.CONFLICT, f"book not found or {message}")
+            return HTTPStatus.OK, {"isbn": isbn, "status": "issued" if op == "issue" else "available"}
+
+        raise HttpError(HTTPStatus.NOT_FOUND, "no such route")
+
+
+async def serve(inventory, host="127.0.0.1", port=8080):
+    service = LibraryService(inventory)
+    host, port = await service.start(host, port)
+    print(f"Serving the library on http://{host}:{port}/books (Ctrl+C to stop)")
+    await service.serve_forever()
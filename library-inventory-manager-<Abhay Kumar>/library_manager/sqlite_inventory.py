@@ -0,0 +1,245 @@
+# library_manager/sqlite_inventory.py
+
+import sqlite3
+import threading
+from pathlib import Path
+from .book import Book
+from .inventory import LibraryInventory
+from .search import tokenize, word_weights
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS books (
+    isbn   TEXT PRIMARY KEY,
+    title  TEXT NOT NULL,
+    author TEXT NOT NULL,
+    status TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS books_title ON books (title COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS books_status ON books (status);
+
+-- Words of each title and author, for search().
+CREATE TABLE IF NOT EXISTS book_words (
+    word   TEXT NOT NULL,
+    isbn   TEXT NOT NULL,
+    weight INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS book_words_word ON book_words (word);
+"""
+
+BOOK_COLUMNS = "title, author, isbn, status"
+
+
+def _word_rows(book):
+    return [(word, book.isbn, weight) for word, weight in word_weights(book).items()]
+
+
+def _prefix_end(prefix):
+    """Smallest string greater than every string starting with prefix."""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+class SqliteInventory:
+    """LibraryInventory with the same API, stored in a SQLite database.
+
+    Books stay on disk and are loaded only as queries need them. Books
+    returned by search methods are copies: change them through
+    issue_book() and return_book(), not book.issue().
+
+    SQLite does its own locking, so several processes can share the
+    database. Writes share one connection behind a lock; reads use a
+    second connection with its own lock, so in WAL mode they never wait
+    for a write transaction (which can wait up to 30s for another
+    process).
+    """
+
+    # Reads run SQL, so the HTTP service calls them from worker threads.
+    reads_in_memory = False
+
+    def __init__(self, db_file="data/catalog.db", json_catalog=None):
+        self.db_file = Path(db_file)
+        # A JSON catalog next to the database is imported on first run.
+        self.json_catalog = Path(json_catalog or self.db_file.with_suffix(".json"))
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(self.db_file, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.load_catalog()
+        self._read_lock = threading.Lock()
+        self._read_conn = sqlite3.connect(self.db_file, timeout=30, check_same_thread=False)
+
+    def load_catalog(self):
+        """Create the tables, and import the JSON catalog the first time."""
+        with self._lock:
+            with self.conn:
+                self.conn.executescript(SCHEMA)
+            empty = self.conn.execute("SELECT 1 FROM books LIMIT 1").fetchone() is None
+            if empty and self.json_catalog.exists():
+                self._migrate_json(self.json_catalog)
+
+    def refresh(self):
+        """Other processes' changes are read straight from the database; nothing to do."""
+
+    def _migrate_json(self, json_catalog):
+        old = LibraryInventory(json_catalog)
+        books = old.display_all()
+        old.close()
+        with self._lock, self.conn:
+            self.conn.executemany(
+                f"INSERT OR IGNORE INTO books ({BOOK_COLUMNS}) VALUES (?, ?, ?, ?)",
+                ((b.title, b.author, b.isbn, b.status) for b in books),
+            )
+            self.conn.executemany(
+                "INSERT INTO book_words (word, isbn, weight) VALUES (?, ?, ?)",
+                (row for b in books for row in _word_rows(b)),
+            )
+
+    def save_catalog(self):
+        """Changes are committed as they happen; nothing to do here."""
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+        with self._read_lock:
+            self._read_conn.close()
+
+    def add_book(self, book):
+        """Add a book. Returns False if its ISBN is already in the catalog."""
+        try:
+            with self._lock, self.conn:
+                self.conn.execute(
+                    f"INSERT INTO books ({BOOK_COLUMNS}) VALUES (?, ?, ?, ?)",
+                    (book.title, book.author, book.isbn, book.status),
+                )
+                self.conn.executemany(
+                    "INSERT INTO book_words (word, isbn, weight) VALUES (?, ?, ?)",
+                    _word_rows(book),
+                )
+        except sqlite3.IntegrityError:
+            return False
+        return True
+
+    def _matching_isbns(self, isbns, condition="", params=()):
+        """The subset of isbns present in the books table (and meeting condition)."""
+        found = set()
+        for start in range(0, len(isbns), 500):
+            chunk = isbns[start:start + 500]
+            rows = self.conn.execute(
+                f"SELECT isbn FROM books WHERE isbn IN ({', '.join('?' * len(chunk))}){condition}",
+                (*chunk, *params))
+            found.update(isbn for isbn, in rows)
+        return found
+
+    def add_books(self, books):
+        """Add many books in one transaction. Returns the books added.
+
+        Books whose ISBN is already in the catalog, or earlier in the
+        batch, are skipped.
+        """
+        batch = {}
+        for book in books:
+            batch.setdefault(book.isbn, book)
+        with self._lock, self.conn:
+            # Take the write lock up front so the duplicate check holds.
+            self.conn.execute("BEGIN IMMEDIATE")
+            existing = self._matching_isbns(list(batch))
+            added = [b for isbn, b in batch.items() if isbn not in existing]
+            self.conn.executemany(
+                f"INSERT INTO books ({BOOK_COLUMNS}) VALUES (?, ?, ?, ?)",
+                ((b.title, b.author, b.isbn, b.status) for b in added),
+            )
+            self.conn.executemany(
+                "INSERT INTO book_words (word, isbn, weight) VALUES (?, ?, ?)",
+                (row for b in added for row in _word_rows(b)),
+            )
+        return added
+
+    def _books(self, sql, params=()):
+        with self._read_lock:
+            cursor = self._read_conn.execute(sql, params)
+        while True:
+            with self._read_lock:
+                rows = cursor.fetchmany(500)
+            if not rows:
+                return
+            for row in rows:
+                yield Book(*row)
+
+    def search_by_title(self, title):
+        pattern = "%" + title.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        return list(self._books(
+            f"SELECT {BOOK_COLUMNS} FROM books WHERE title LIKE ? ESCAPE '\\'", (pattern,)))
+
+    def search(self, query, limit=None):
+        """Find books by words from the title or author, best match first.
+
+        Each word matches as a prefix, and every word must match.
+        """
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+
+        # One row per (term, book) with the book's best score for that term.
+        per_term = []
+        params = []
+        for term in terms:
+            per_term.append(
+                "SELECT isbn, MAX(weight * (CASE WHEN word = ? THEN 2 ELSE 1 END)) AS score"
+                " FROM book_words WHERE word >= ? AND word < ? GROUP BY isbn"
+            )
+            params += [term, term, _prefix_end(term)]
+
+        sql = (
+            f"SELECT {', '.join('b.' + c for c in BOOK_COLUMNS.split(', '))}"
+            f" FROM ({' UNION ALL '.join(per_term)}) AS m"
+            " JOIN books AS b ON b.isbn = m.isbn"
+            " GROUP BY m.isbn HAVING COUNT(*) = ?"
+            " ORDER BY SUM(m.score) DESC, b.title"
+        )
+        params.append(len(terms))
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return list(self._books(sql, params))
+
+    def search_by_isbn(self, isbn):
+        with self._read_lock:
+            row = self._read_conn.execute(
+                f"SELECT {BOOK_COLUMNS} FROM books WHERE isbn = ?", (isbn,)).fetchone()
+        return Book(*row) if row else None
+
+    def display_all(self):
+        """Yield every book, reading rows from the database in batches."""
+        return self._books(f"SELECT {BOOK_COLUMNS} FROM books ORDER BY rowid")
+
+    def _set_status(self, isbn, old, new):
+        # The check and the update are one statement, so two desks can't
+        # both issue the same copy.
+        with self._lock, self.conn:
+            cursor = self.conn.execute(
+                "UPDATE books SET status = ? WHERE isbn = ? AND status = ?", (new, isbn, old))
+        return cursor.rowcount == 1
+
+    def issue_book(self, isbn):
+        return self._set_status(isbn, "available", "issued")
+
+    def return_book(self, isbn):
+        return self._set_status(isbn, "issued", "available")
+
+    def _set_status_many(self, isbns, old, new):
+        isbns = list(dict.fromkeys(isbns))
+        with self._lock, self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            matching = self._matching_isbns(isbns, " AND status = ?", (old,))
+            changed = [isbn for isbn in isbns if isbn in matching]
+            self.conn.executemany(
+                "UPDATE books SET status = ? WHERE isbn = ?", ((new, isbn) for isbn in changed))
+        return changed
+
+    def issue_many(self, isbns):
+        """Issue every available book in isbns in one transaction. Returns the ISBNs issued."""
+        return self._set_status_many(isbns, "available", "issued")
+
+    def return_many(self, isbns):
+        """Return every issued book in isbns in one transaction. Returns the ISBNs returned."""
+        return self._set_status_many(isbns, "issued", "available")
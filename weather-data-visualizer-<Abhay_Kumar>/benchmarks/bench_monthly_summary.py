@@ -0,0 +1,68 @@
+# benchmarks/bench_monthly_summary.py
+#
+# monthly_summary.csv from a long hourly archive: loading the whole file
+# (monthly_summary(clean_weather(...))) against the chunked
+# stream_monthly_summary. Reports time and peak traced memory.
+# Run from the project folder:
+#   python -m benchmarks.bench_monthly_summary [hours]
+
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from weather import NUM_COLS, clean_weather, monthly_summary, stream_monthly_summary
+
+
+def write_archive(path, n):
+    rng = np.random.default_rng(5)
+    df = pd.DataFrame({
+        "Date": pd.date_range("2000-01-01", periods=n, freq="h"),
+        "Temperature": (20 + 8 * np.sin(np.arange(n) / 24 * 2 * np.pi) + rng.normal(0, 2, n)).round(1),
+        "Humidity": rng.uniform(20, 95, n).round(1),
+        "Rainfall": rng.exponential(0.3, n).round(2),
+    })
+    for col in NUM_COLS:
+        df.loc[rng.random(n) < 0.01, col] = np.nan
+    df.to_csv(path, index=False)
+
+
+def measure(fn, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn(*args)
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, seconds, peak / 2**20
+
+
+def in_memory(path):
+    return monthly_summary(clean_weather(pd.read_csv(path)))
+
+
+def main():
+    hours = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "archive.csv"
+        write_archive(path, hours)
+        print(f"{hours:,} hourly readings, {path.stat().st_size / 2**20:.0f} MB of CSV")
+
+        ref, t_mem, m_mem = measure(in_memory, path)
+        got, t_stream, m_stream = measure(stream_monthly_summary, [path], 100_000)
+
+    print(f"{'method':<12}{'time':>10}{'peak memory':>14}")
+    print(f"{'in memory':<12}{t_mem:>9.2f}s{m_mem:>11.0f} MB")
+    print(f"{'streaming':<12}{t_stream:>9.2f}s{m_stream:>11.0f} MB")
+    # Missing values are filled with a sketched median when streaming, so the
+    # two can differ slightly.
+    diff = np.nanmax(np.abs(ref.to_numpy() - got.to_numpy()))
+    print(f"{len(ref)} months, largest difference {diff:.2g}")
+
+
+if __name__ == "__main__":
+    main()
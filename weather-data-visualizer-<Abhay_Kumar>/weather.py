@@ -1,13 +1,41 @@
 # Weather Data Visualizer
 
 # === Import required libraries ===
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
+import argparse
+import glob
+import hashlib
+import importlib.util
+import json
 import os
+import sys
+from collections import Counter
+from functools import partial
+from pathlib import Path
+
+
+def _lazy_import(name):
+    """Return module `name`, loaded on first attribute access.
+
+    pandas, NumPy and matplotlib take most of the startup time, and
+    `--help` or a stats run should not pay for what it doesn't use.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+pd = _lazy_import("pandas")
+np = _lazy_import("numpy")
+
+NUM_COLS = ["Temperature", "Humidity", "Rainfall"]
+DATE_COL = "Date"
 
-# Make a folder for saved plots
-os.makedirs("plots", exist_ok=True)
 
 # =============================================================
 # TASK 1 — Load the dataset
@@ -15,121 +43,736 @@ os.makedirs("plots", exist_ok=True)
 # If user has a file named "weather.csv" in the same folder, it will use that.
 # Otherwise, it will generate a small example dataset automatically.
 
-if os.path.exists("weather.csv"):
-    print("Loading weather.csv...")
-    df = pd.read_csv("weather.csv")
-else:
-    print("weather.csv not found — creating example dataset...")
+def example_dataset():
     dates = pd.date_range("2023-01-01", "2023-03-31")
     temp = 25 + np.random.randn(len(dates)) * 3
     humidity = 50 + np.random.randn(len(dates)) * 8
     rainfall = np.abs(np.random.randn(len(dates))) * 2
 
-    df = pd.DataFrame({
+    return pd.DataFrame({
         "Date": dates,
         "Temperature": temp,
         "Humidity": humidity,
         "Rainfall": rainfall
     })
 
-print("First 5 rows:")
-print(df.head())
+
+def load_weather(paths):
+    """Read one or more station files into one frame (the example data if none exist)."""
+    paths = [p for p in paths if os.path.exists(p)]
+    if not paths:
+        print("weather.csv not found — creating example dataset...")
+        return example_dataset()
+    for p in paths:
+        print(f"Loading {p}...")
+    frames = [pd.read_csv(p) for p in paths]
+    return frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+
 
 # =============================================================
 # TASK 2 — Cleaning and processing
 # =============================================================
-df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
-df = df.dropna(subset=["Date"])  # remove invalid dates
 
-# Fill missing numeric values with median
-num_cols = ["Temperature", "Humidity", "Rainfall"]
-for col in num_cols:
-    df[col] = pd.to_numeric(df[col], errors="coerce")
-    df[col] = df[col].fillna(df[col].median())
+def clean_weather(df):
+    """Parse dates, drop rows without one, and fill missing numbers with the column median."""
+    df = df.copy()
+    df[DATE_COL] = pd.to_datetime(df[DATE_COL], errors="coerce")
+    df = df.dropna(subset=[DATE_COL])  # remove invalid dates
+
+    # All numeric columns are converted and filled together.
+    values = df[NUM_COLS].apply(pd.to_numeric, errors="coerce")
+    df[NUM_COLS] = values.fillna(values.median())
+    return df
 
-print("Cleaned data info:")
-print(df.info())
 
 # =============================================================
 # TASK 3 — NumPy statistical analysis
 # =============================================================
-stats = {}
-for col in num_cols:
-    arr = df[col].values
-    stats[col] = {
-        "mean": np.mean(arr),
-        "min": np.min(arr),
-        "max": np.max(arr),
-        "std": np.std(arr)
-    }
 
-print("Statistics:")
-for k, v in stats.items():
-    print(k, v)
+class RunningStats:
+    """count, mean, min, max and M2 (sum of squared deviations) of a column.
+
+    update() folds in a block of values; merge() combines two
+    accumulators (Chan et al.), so stats can be gathered per chunk, per
+    file or per process and added up. Blocks are reduced while they are
+    in cache, so each value is read from memory once for all five
+    numbers.
+    """
+
+    # Values per block; small enough to stay in the CPU cache.
+    BLOCK = 1 << 16
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        for start in range(0, len(values), self.BLOCK):
+            block = values[start:start + self.BLOCK]
+            mean = block.mean()
+            self._merge(len(block), mean, np.square(block - mean).sum(), block.min(), block.max())
+        return self
+
+    def add_constant(self, value, count):
+        """Fold in `count` copies of value (used for median-filled gaps)."""
+        if count:
+            self._merge(count, float(value), 0.0, value, value)
+        return self
+
+    def merge(self, other):
+        if other.count:
+            self._merge(other.count, other.mean, other.m2, other.min, other.max)
+        return self
+
+    def _merge(self, count, mean, m2, lo, hi):
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+        self.min = min(self.min, lo)
+        self.max = max(self.max, hi)
+
+    @property
+    def std(self):
+        # Population std, like np.std.
+        return float(np.sqrt(self.m2 / self.count)) if self.count else np.nan
+
+    def state(self):
+        """Everything needed to merge these stats later, as plain numbers."""
+        return {"count": self.count, "mean": float(self.mean), "m2": float(self.m2),
+                "min": float(self.min), "max": float(self.max)}
+
+    @classmethod
+    def from_state(cls, state):
+        stats = cls()
+        stats.count, stats.mean, stats.m2 = state["count"], state["mean"], state["m2"]
+        stats.min, stats.max = state["min"], state["max"]
+        return stats
+
+    def as_dict(self):
+        return {"mean": float(self.mean), "min": float(self.min), "max": float(self.max), "std": self.std}
+
+
+class MedianSketch:
+    """Approximate median from a fixed-size uniform sample (reservoir sampling).
+
+    Memory stays at `size` values however many are seen; with the
+    default size the estimate is within a fraction of a percentile.
+    """
+
+    def __init__(self, size=100_000, seed=0):
+        self.size = size
+        self.sample = np.empty(0)
+        self.seen = 0
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        room = self.size - len(self.sample)
+        if room > 0:
+            self.sample = np.concatenate((self.sample, values[:room]))
+            self.seen += min(room, len(values))
+            values = values[room:]
+        if len(values):
+            # Value number i (1-based, over all values) replaces a random
+            # slot with probability size / i.
+            positions = self.seen + np.arange(1, len(values) + 1)
+            slots = (self._rng.random(len(values)) * positions).astype(np.int64)
+            keep = slots < self.size
+            # Later values win when two land on the same slot, as they
+            # would if processed one at a time.
+            self.sample[slots[keep]] = values[keep]
+            self.seen += len(values)
+        return self
+
+    def median(self):
+        return float(np.median(self.sample)) if len(self.sample) else np.nan
+
+
+def column_stats(df):
+    """A RunningStats per numeric column, each filled in one pass."""
+    return {col: RunningStats().update(df[col].to_numpy()) for col in NUM_COLS}
+
+
+def compute_stats(df):
+    """mean, min, max and std of each numeric column."""
+    return {col: s.as_dict() for col, s in column_stats(df).items()}
+
+
+def stream_weather(paths, chunksize=1_000_000, freqs=()):
+    """Column stats and per-bucket stats of clean_weather(...) in one chunked read.
+
+    freqs are resample rules ("D", "ME"); each gets a BucketStats.
+    Missing values would be filled with the median, so they are counted
+    and folded in as copies of the (sketched) median at the end.
+    Returns (RunningStats per column, BucketStats per freq).
+    """
+    stats = {col: RunningStats() for col in NUM_COLS}
+    medians = {col: MedianSketch() for col in NUM_COLS}
+    missing = dict.fromkeys(NUM_COLS, 0)
+    buckets = {freq: BucketStats(freq) for freq in freqs}
+    for path in paths:
+        for chunk in pd.read_csv(path, usecols=[DATE_COL] + NUM_COLS, chunksize=chunksize):
+            dates = pd.to_datetime(chunk[DATE_COL], errors="coerce")
+            valid = dates.notna().to_numpy()
+            values = chunk[NUM_COLS][valid].apply(pd.to_numeric, errors="coerce")
+            for col in NUM_COLS:
+                column = values[col].to_numpy(dtype=np.float64)
+                stats[col].update(column)
+                medians[col].update(column)
+                missing[col] += int(np.isnan(column).sum())
+            for bucket in buckets.values():
+                bucket.update(dates[valid], values)
+
+    fill = {col: medians[col].median() for col in NUM_COLS}
+    for col in NUM_COLS:
+        stats[col].add_constant(fill[col], missing[col])
+    for bucket in buckets.values():
+        bucket.fill_missing(fill)
+    return stats, buckets
+
+
+def stream_stats(paths, chunksize=1_000_000):
+    """compute_stats(clean_weather(...)) for files too big to load, in one read."""
+    stats, _ = stream_weather(paths, chunksize)
+    return {col: s.as_dict() for col, s in stats.items()}
+
 
 # =============================================================
 # TASK 4 — Matplotlib Visualizations
 # =============================================================
-# 1. Daily temperature line chart
-plt.figure(figsize=(8,4))
-plt.plot(df["Date"], df["Temperature"])
-plt.title("Daily Temperature")
-plt.xlabel("Date")
-plt.ylabel("Temperature")
-plt.tight_layout()
-plt.savefig("plots/daily_temperature.png")
-plt.close()
-
-# 2. Monthly rainfall bar chart
-monthly_rain = df.set_index("Date")["Rainfall"].resample("ME").sum()
-plt.figure(figsize=(6,4))
-plt.bar(monthly_rain.index.astype(str), monthly_rain.values)
-plt.title("Monthly Rainfall")
-plt.xticks(rotation=45)
-plt.tight_layout()
-plt.savefig("plots/monthly_rainfall.png")
-plt.close()
-
-# 3. Scatter: humidity vs temperature
-plt.figure(figsize=(6,4))
-plt.scatter(df["Temperature"], df["Humidity"], alpha=0.6)
-plt.title("Humidity vs Temperature")
-plt.xlabel("Temperature")
-plt.ylabel("Humidity")
-plt.tight_layout()
-plt.savefig("plots/humidity_vs_temperature.png")
-plt.close()
-
-# 4. Combined plot (Temperature + Rainfall)
-plt.figure(figsize=(8,4))
-plt.plot(df["Date"], df["Temperature"], label="Temperature")
-plt.bar(df["Date"], df["Rainfall"], alpha=0.3, label="Rainfall")
-plt.legend()
-plt.title("Temperature + Rainfall Combined")
-plt.tight_layout()
-plt.savefig("plots/combined_plot.png")
-plt.close()
+
+# Each plot is a function drawing into a matplotlib Figure (no pyplot
+# state), so plots can be rendered in worker processes. A plot is only
+# redrawn when the hash of the data it uses differs from the one stored
+# next to the image in PLOT_CACHE.
+
+PLOT_CACHE = ".plot_cache.json"
+# Bump when a plot function changes, to redraw every cached image.
+PLOT_VERSION = 1
+
+
+def _downsample_line(x, y, max_points):
+    """Keep the min and max of each of max_points / 2 bins, in order."""
+    n = len(y)
+    if not max_points or n <= max_points:
+        return x, y
+    bins = max(max_points // 2, 1)
+    edges = np.linspace(0, n, bins + 1).astype(np.int64)
+    keep = []
+    for lo, hi in zip(edges[:-1], edges[1:]):
+        if hi > lo:
+            block = y[lo:hi]
+            keep += sorted({lo + int(np.argmin(block)), lo + int(np.argmax(block))})
+    keep = np.array(keep)
+    return x[keep], y[keep]
+
+
+def plot_daily_temperature(fig, df, max_points=None):
+    ax = fig.subplots()
+    dates, temp = _downsample_line(df["Date"].to_numpy(), df["Temperature"].to_numpy(), max_points)
+    ax.plot(dates, temp)
+    ax.set_title("Daily Temperature")
+    ax.set_xlabel("Date")
+    ax.set_ylabel("Temperature")
+
+
+def plot_monthly_rainfall(fig, df, max_points=None):
+    ax = fig.subplots()
+    monthly_rain = df.set_index("Date")["Rainfall"].resample("ME").sum()
+    ax.bar(monthly_rain.index.astype(str), monthly_rain.values)
+    ax.set_title("Monthly Rainfall")
+    ax.tick_params(axis="x", rotation=45)
+
+
+def plot_humidity_vs_temperature(fig, df, max_points=None):
+    ax = fig.subplots()
+    if max_points and len(df) > max_points:
+        df = df.sample(max_points, random_state=0)
+    ax.scatter(df["Temperature"], df["Humidity"], alpha=0.6)
+    ax.set_title("Humidity vs Temperature")
+    ax.set_xlabel("Temperature")
+    ax.set_ylabel("Humidity")
+
+
+def plot_combined(fig, df, max_points=None):
+    ax = fig.subplots()
+    dates = df["Date"].to_numpy()
+    ax.plot(*_downsample_line(dates, df["Temperature"].to_numpy(), max_points), label="Temperature")
+    # One filled step outline instead of a bar per day.
+    ax.fill_between(*_downsample_line(dates, df["Rainfall"].to_numpy(), max_points),
+                    step="mid", alpha=0.3, label="Rainfall")
+    ax.legend()
+    ax.set_title("Temperature + Rainfall Combined")
+
+
+# name -> (function, figure size, columns it reads)
+PLOTS = {
+    "daily_temperature": (plot_daily_temperature, (8, 4), ["Date", "Temperature"]),
+    "monthly_rainfall": (plot_monthly_rainfall, (6, 4), ["Date", "Rainfall"]),
+    "humidity_vs_temperature": (plot_humidity_vs_temperature, (6, 4), ["Temperature", "Humidity"]),
+    "combined_plot": (plot_combined, (8, 4), ["Date", "Temperature", "Rainfall"]),
+}
+
+
+def _plot_hash(name, df, fmt, max_points):
+    columns = PLOTS[name][2]
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{PLOT_VERSION}:{name}:{fmt}:{max_points}".encode())
+    digest.update(pd.util.hash_pandas_object(df[columns], index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def render_plot(name, df, path, max_points=None):
+    """Draw one plot from PLOTS into path (format taken from the suffix)."""
+    from matplotlib.figure import Figure
+
+    function, size, _ = PLOTS[name]
+    fig = Figure(figsize=size)
+    function(fig, df, max_points)
+    fig.tight_layout()
+    fig.savefig(path)
+
+
+def make_plots(df, plot_dir="plots", fmt="png", max_points=None, workers=1):
+    """Write the four plots, skipping those whose data hasn't changed.
+
+    fmt is "png" or "svg". max_points caps the points drawn per series.
+    With workers > 1 the plots are drawn in parallel processes. Returns
+    the names of the plots drawn.
+    """
+    plot_dir = Path(plot_dir)
+    plot_dir.mkdir(parents=True, exist_ok=True)
+    cache_path = plot_dir / PLOT_CACHE
+    try:
+        cache = json.loads(cache_path.read_text())
+    except (FileNotFoundError, ValueError):
+        cache = {}
+
+    jobs = {}
+    for name in PLOTS:
+        path = plot_dir / f"{name}.{fmt}"
+        digest = _plot_hash(name, df, fmt, max_points)
+        if cache.get(path.name) != digest or not path.exists():
+            jobs[name] = (path, digest)
+
+    if workers > 1 and len(jobs) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(render_plot, name, df[PLOTS[name][2]], path, max_points)
+                       for name, (path, _) in jobs.items()]
+            for future in futures:
+                future.result()
+    else:
+        for name, (path, _) in jobs.items():
+            render_plot(name, df, path, max_points)
+
+    cache.update({path.name: digest for path, digest in jobs.values()})
+    cache_path.write_text(json.dumps(cache, indent=1))
+    return list(jobs)
+
 
 # =============================================================
 # TASK 5 — Grouping & Aggregation
 # =============================================================
-df.set_index("Date", inplace=True)
-monthly = df.resample("ME").mean()
-monthly.to_csv("monthly_summary.csv")
+
+def monthly_summary(df):
+    return df.set_index(DATE_COL)[NUM_COLS].resample("ME").mean()
+
+
+def _merge_buckets(a, b):
+    """Merge two sets of per-bucket partials, like RunningStats.merge for each cell."""
+    if a is None:
+        return b
+    index = a["count"].index.union(b["count"].index)
+    a = {k: v.reindex(index) for k, v in a.items()}
+    b = {k: v.reindex(index) for k, v in b.items()}
+    na, nb = a["count"].fillna(0), b["count"].fillna(0)
+    total = na + nb
+    delta = b["mean"].fillna(0) - a["mean"].fillna(0)
+    share = (nb / total).fillna(0)
+    return {
+        "count": total,
+        "mean": a["mean"].fillna(0) + delta * share,
+        "m2": a["m2"].fillna(0) + b["m2"].fillna(0) + delta * delta * na * share,
+        "min": np.fmin(a["min"], b["min"]),
+        "max": np.fmax(a["max"], b["max"]),
+    }
+
+
+class BucketStats:
+    """count, mean, M2, min and max of each numeric column per time bucket.
+
+    The out-of-core version of df.resample(freq): update() reduces a
+    chunk with one resample and merges its buckets into the totals, so
+    memory grows with the number of buckets (days, months), not rows.
+    Chunks may come in any order and share buckets.
+    """
+
+    def __init__(self, freq="ME"):
+        self.freq = freq
+        self.parts = None
+        self.missing = None
+
+    def update(self, dates, values):
+        """Fold in a chunk: dates (Series) and the numeric columns, NaN where missing."""
+        values = values.set_axis(pd.DatetimeIndex(dates.to_numpy()))
+        groups = values.resample(self.freq)
+        count = groups.count()
+        part = {
+            "count": count,
+            "mean": groups.mean(),
+            "m2": groups.var(ddof=0).fillna(0) * count,
+            "min": groups.min(),
+            "max": groups.max(),
+        }
+        self.parts = _merge_buckets(self.parts, part)
+        missing = values.isna().resample(self.freq).sum()
+        self.missing = missing if self.missing is None else self.missing.add(missing, fill_value=0)
+        return self
+
+    def fill_missing(self, fill):
+        """Count each missing value as fill[column], as clean_weather does with the median."""
+        if self.missing is None:
+            return self
+        has = self.missing > 0
+        constant = pd.DataFrame(fill, index=self.missing.index)[self.missing.columns]
+        self.parts = _merge_buckets(self.parts, {
+            "count": self.missing,
+            "mean": constant,
+            "m2": constant * 0,
+            "min": constant.where(has),
+            "max": constant.where(has),
+        })
+        self.missing = self.missing * 0
+        return self
+
+    def result(self, stat="mean"):
+        """One frame per stat (count, mean, sum, min, max, std), indexed like resample()."""
+        if self.parts is None:
+            return pd.DataFrame(columns=NUM_COLS, dtype=float).rename_axis(DATE_COL)
+        count = self.parts["count"]
+        if stat == "count":
+            frame = count
+        elif stat == "sum":
+            frame = self.parts["mean"] * count
+        elif stat == "std":
+            frame = np.sqrt(self.parts["m2"] / count)
+        else:
+            frame = self.parts[stat]
+        frame = frame.where(count > 0) if stat not in ("count", "sum") else frame
+        # resample() has a row for every bucket in the range, even empty ones.
+        full = pd.date_range(count.index.min(), count.index.max(), freq=self.freq)
+        fill = 0 if stat in ("count", "sum") else np.nan
+        return frame.reindex(full, fill_value=fill).rename_axis(DATE_COL)
+
+
+def stream_monthly_summary(paths, chunksize=1_000_000):
+    """monthly_summary(clean_weather(...)) for files too big to load."""
+    _, buckets = stream_weather(paths, chunksize, freqs=("ME",))
+    return buckets["ME"].result("mean")
+
 
 # =============================================================
 # TASK 6 — Export cleaned data + report
 # =============================================================
-df.to_csv("cleaned_weather.csv")
-
-with open("summary_report.txt", "w") as f:
-    f.write("Weather Data Summary Report")
-    f.write("===========================")
-    for col, v in stats.items():
-        f.write(f"{col} -> mean={v['mean']:.2f}, min={v['min']:.2f}, max={v['max']:.2f}, std={v['std']:.2f}\n")
-
-print("All tasks completed. Files saved:")
-print("- cleaned_weather.csv")
-print("- monthly_summary.csv")
-print("- summary_report.txt")
-print("- plots/ (4 images)")
+
+def write_report(stats, path="summary_report.txt"):
+    with open(path, "w") as f:
+        f.write("Weather Data Summary Report")
+        f.write("===========================")
+        for col, v in stats.items():
+            f.write(f"{col} -> mean={v['mean']:.2f}, min={v['min']:.2f}, max={v['max']:.2f}, std={v['std']:.2f}\n")
+
+
+def write_exports(df, out):
+    """monthly_summary.csv and cleaned_weather.csv for a cleaned frame."""
+    out = Path(out)
+    monthly_summary(df).to_csv(out / "monthly_summary.csv")
+    df.set_index(DATE_COL).to_csv(out / "cleaned_weather.csv")
+
+
+def write_outputs(df, stats, out, plot_options=None):
+    """Plots, exports and report for a cleaned frame.
+
+    plot_options are passed on to make_plots. Returns the plots redrawn.
+    """
+    out = Path(out)
+    drawn = make_plots(df, out / "plots", **(plot_options or {}))
+    write_exports(df, out)
+    write_report(stats, out / "summary_report.txt")
+    return drawn
+
+
+# =============================================================
+# BATCH MODE — many stations in parallel
+# =============================================================
+# Each station file gets its own output folder, named after the file.
+# Files that share a name are told apart by their path below the folder
+# the files have in common (e.g. "north/s" and "south/s"). A manifest in the batch
+# output folder remembers each file's size, mtime and hash together with
+# its statistics and the plot options used, so unchanged stations are
+# skipped on the next run and still count towards the combined summary.
+
+MANIFEST = "batch_manifest.json"
+
+
+def station_files(patterns):
+    """CSV files named by directories, glob patterns or plain paths."""
+    files = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            files += sorted(Path(pattern).glob("*.csv"))
+        else:
+            files += sorted(Path(p) for p in glob.glob(pattern))
+    unique = {}
+    for path in files:
+        unique.setdefault(path.resolve(), path)
+    return list(unique.values())
+
+
+def station_names(files):
+    """A unique station name for each file: its stem, or for stems
+    shared by several files, the path below their common folder."""
+    stems = Counter(path.stem for path in files)
+    clashing = [path.resolve() for path in files if stems[path.stem] > 1]
+    root = Path(os.path.commonpath([path.parent for path in clashing])) if clashing else None
+    return {path: (path.stem if stems[path.stem] == 1
+                   else path.resolve().relative_to(root).with_suffix("").as_posix())
+            for path in files}
+
+
+def _file_hash(path):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        while block := f.read(1 << 20):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _unchanged(path, entry):
+    """Whether path still matches its manifest entry.
+
+    Size and mtime settle most cases without reading the file; a file
+    with the same size but a new mtime is hashed, so touching it does
+    not trigger a rerun. Updates entry's mtime in that case.
+    """
+    st = path.stat()
+    if st.st_size != entry["size"]:
+        return False
+    if st.st_mtime_ns != entry["mtime_ns"]:
+        if _file_hash(path) != entry["hash"]:
+            return False
+        entry["mtime_ns"] = st.st_mtime_ns
+    return True
+
+
+def process_station(path, out, plot_options=None):
+    """Run the whole pipeline for one station. Returns its stats state, or an error."""
+    try:
+        st = path.stat()
+        source = {"source": str(path), "size": st.st_size, "mtime_ns": st.st_mtime_ns,
+                  "hash": _file_hash(path)}
+        df = clean_weather(pd.read_csv(path))
+        stats = column_stats(df)
+        write_outputs(df, {col: s.as_dict() for col, s in stats.items()}, out, plot_options)
+    except Exception as e:
+        return {"error": f"{type(e).__name__}: {e}"}
+    return {**source, "plot_options": plot_options or {},
+            "stats": {col: s.state() for col, s in stats.items()}}
+
+
+def run_batch(patterns, out="batch_output", workers=None, force=False, plot_options=None):
+    """Process every station file across a process pool and write a combined summary.
+
+    Stations are reprocessed when their file changed or when plot_options
+    differ from their last run. Returns the number of stations processed
+    (not skipped).
+    """
+    plot_options = {"fmt": "png", "max_points": None, **(plot_options or {})}
+    out = Path(out)
+    out.mkdir(parents=True, exist_ok=True)
+    files = station_files(patterns)
+    if not files:
+        print("No station files found!")
+        return 0
+
+    manifest_path = out / MANIFEST
+    try:
+        manifest = json.loads(manifest_path.read_text())
+    except (FileNotFoundError, ValueError):
+        manifest = {}
+
+    names = station_names(files)
+    stations = {}
+    todo = []
+    for path in files:
+        name = names[path]
+        entry = manifest.get(name)
+        if (not force and entry and entry["source"] == str(path)
+                and entry.get("plot_options") == plot_options
+                and (out / name).is_dir() and _unchanged(path, entry)):
+            stations[name] = entry
+        else:
+            todo.append(path)
+    print(f"{len(files)} station(s): {len(todo)} to process, {len(files) - len(todo)} unchanged")
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(partial(process_station, plot_options=plot_options),
+                           todo, [out / names[p] for p in todo])
+        for path, result in zip(todo, results):
+            if "error" in result:
+                print(f"Error processing {path}: {result['error']}")
+            else:
+                stations[names[path]] = result
+
+    manifest_path.write_text(json.dumps(stations, indent=1))
+    write_combined_summary(stations, out)
+    return len(todo)
+
+
+def write_combined_summary(stations, out):
+    """stations_summary.csv (one row per station plus ALL) and combined_report.txt."""
+    rows = []
+    combined = {col: RunningStats() for col in NUM_COLS}
+    for name, entry in sorted(stations.items()):
+        row = {"station": name}
+        for col in NUM_COLS:
+            stats = RunningStats.from_state(entry["stats"][col])
+            combined[col].merge(stats)
+            row.update({f"{col}_{k}": v for k, v in stats.as_dict().items()})
+        rows.append(row)
+    all_row = {"station": "ALL"}
+    for col, stats in combined.items():
+        all_row.update({f"{col}_{k}": v for k, v in stats.as_dict().items()})
+    rows.append(all_row)
+
+    pd.DataFrame(rows).to_csv(out / "stations_summary.csv", index=False)
+    write_report({col: s.as_dict() for col, s in combined.items()}, out / "combined_report.txt")
+    print(f"Combined summary of {len(stations)} station(s) saved in {out}")
+
+
+COMMANDS = ["run", "stats", "plot", "export", "batch"]
+
+
+def _add_plot_options(parser):
+    parser.add_argument("--plot-format", choices=["png", "svg"], default="png")
+    parser.add_argument("--max-points", type=int,
+                        help="draw at most this many points per series (downsampled)")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Weather Data Visualizer",
+        epilog="Without a command, 'run' is assumed: python weather.py [files]")
+    commands = parser.add_subparsers(dest="command")
+
+    def command(name, help):
+        sub = commands.add_parser(name, help=help)
+        sub.add_argument("files", nargs="*", default=["weather.csv"],
+                         help="station CSV files, read as one dataset (default: weather.csv)")
+        sub.add_argument("--out", default=".", help="folder for the output files")
+        return sub
+
+    run = command("run", "clean, analyze, plot and export (the default)")
+    _add_plot_options(run)
+    run.add_argument("--plot-workers", type=int, default=1,
+                     help="processes drawing the four plots")
+
+    stats = command("stats", "write summary_report.txt only")
+    stats.add_argument("--stream", action="store_true",
+                       help="read the files in chunks, for files too big to load")
+
+    plot = command("plot", "draw the plots only")
+    _add_plot_options(plot)
+    plot.add_argument("--plot-workers", type=int, default=1)
+
+    export = command("export", "write cleaned_weather.csv and monthly_summary.csv only")
+    export.add_argument("--stream", action="store_true",
+                        help="read the files in chunks and write monthly_summary.csv only")
+
+    batch = commands.add_parser(
+        "batch", help="process each station separately, in parallel, with a combined summary")
+    batch.add_argument("files", nargs="+", help="station files, directories or glob patterns")
+    batch.add_argument("--out", default="batch_output")
+    batch.add_argument("--workers", type=int, help="processes (default: all CPUs)")
+    batch.add_argument("--force", action="store_true",
+                       help="reprocess stations even if unchanged")
+    _add_plot_options(batch)
+
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv or (argv[0] not in COMMANDS and argv[0] not in ("-h", "--help")):
+        argv = ["run"] + argv
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.command == "batch":
+        # Stations already run in parallel; each draws its plots itself.
+        plot_options = {"fmt": args.plot_format, "max_points": args.max_points}
+        run_batch(args.files, args.out, args.workers, args.force, plot_options)
+        return
+
+    out = Path(args.out)
+    out.mkdir(parents=True, exist_ok=True)
+
+    if args.command == "stats" and args.stream:
+        files = [p for p in args.files if os.path.exists(p)]
+        stats = stream_stats(files) if files else compute_stats(clean_weather(example_dataset()))
+        write_report(stats, out / "summary_report.txt")
+        print(f"Saved {out / 'summary_report.txt'}")
+        return
+
+    if args.command == "export" and args.stream:
+        files = [p for p in args.files if os.path.exists(p)]
+        summary = (stream_monthly_summary(files) if files
+                   else monthly_summary(clean_weather(example_dataset())))
+        summary.to_csv(out / "monthly_summary.csv")
+        print(f"Saved {out / 'monthly_summary.csv'}")
+        return
+
+    df = load_weather(args.files)
+    if args.command == "run":
+        print("First 5 rows:")
+        print(df.head())
+
+    df = clean_weather(df)
+    if args.command == "run":
+        print("Cleaned data info:")
+        print(df.info())
+
+    saved = []
+    if args.command in ("run", "stats"):
+        stats = compute_stats(df)
+        print("Statistics:")
+        for k, v in stats.items():
+            print(k, v)
+        write_report(stats, out / "summary_report.txt")
+        saved.append("summary_report.txt")
+
+    if args.command in ("run", "export"):
+        write_exports(df, out)
+        saved += ["cleaned_weather.csv", "monthly_summary.csv"]
+
+    if args.command in ("run", "plot"):
+        drawn = make_plots(df, out / "plots", args.plot_format, args.max_points, args.plot_workers)
+        saved.append(f"plots/ (4 images, {len(drawn)} redrawn)")
+
+    print("All tasks completed. Files saved:")
+    for name in saved:
+        print(f"- {name}")
+
+
+if __name__ == "__main__":
+    main()